@@ -1,10 +1,15 @@
 from botocore.client import BaseClient
 from fastapi import Depends
+from redis import Redis
 from sqlalchemy.orm import Session
 
-from app.auth import AuthRepository
+from app.auth import AuthRepository, schemas
 from app.core.cognito import get_cognito_client
 from app.core.database import get_db
+from app.core.entities.auth_user import AuthUser
+from app.core.exceptions import NotFoundError
+from app.core.middleware.auth_user import get_current_user
+from app.core.redis import get_redis_client
 
 
 async def get_auth_repo(cognito: BaseClient = Depends(get_cognito_client), database: Session = Depends(get_db)):
@@ -15,3 +20,27 @@ async def get_auth_service(repo: AuthRepository = Depends(get_auth_repo)):
     from app.auth import AuthService
 
     return AuthService(repo)
+
+
+async def get_current_db_user(
+        current_user: AuthUser = Depends(get_current_user),
+        repo: AuthRepository = Depends(get_auth_repo),
+        redis_client: Redis = Depends(get_redis_client),
+) -> schemas.UserRead:
+    """The authenticated caller's database row, with ``email_verified`` taken from Cognito.
+
+    FastAPI resolves a dependency once per request, so a route and its other
+    dependencies can all depend on this (and on ``get_current_user``) without
+    repeating the Cognito call or the lookup. A row still missing after signup
+    (its background insert failed) is created here from the Cognito identity.
+    """
+    from app.auth import AuthService
+
+    service = AuthService(repo, redis_client)
+    try:
+        database_user = await service.get_user_by_cognito_sub(current_user.sub)
+    except NotFoundError:
+        await repo.create_user(name=current_user.name, email=current_user.email, cognito_sub=current_user.sub)
+        database_user = await service.get_user_by_cognito_sub(current_user.sub)
+    database_user.email_verified = current_user.email_verified
+    return database_user
@@ -3,12 +3,14 @@ from typing import Any
 
 from botocore.client import BaseClient
 from botocore.exceptions import ClientError
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.auth.models import User
 from app.core.config import settings
-from app.core.exceptions import InternalServerError, CognitoError
+from app.core.exceptions import ConflictError, InternalServerError, CognitoError
 from app.core.security import get_secret_hash
 
 COGNITO_CLIENT_ID = settings.COGNITO_CLIENT_ID
@@ -22,7 +24,8 @@ class AuthRepository:
         self.cognito = cognito
         self.db = database
 
-    async def register_user(self, email: str, password: str, name: str):
+    async def register_user(self, email: str, password: str, name: str) -> str:
+        """Create the Cognito user and return its ``sub``; the local row is written by ``create_user``."""
         try:
             response = self.cognito.sign_up(
                 ClientId=settings.COGNITO_CLIENT_ID,
@@ -38,24 +41,48 @@ class AuthRepository:
                     {'Name': 'name', 'Value': name}
                 ]
             )
-
-            cognito_sub = response.get('UserSub')
-
-            if not cognito_sub:
-                logger.error("Cognito sign_up did not return UserSub")
-                raise InternalServerError("Failed to register user")
-
-            try:
-                user = User(name=name, email=email, cognito_sub=cognito_sub)
-                self.db.add(user)
-                self.db.commit()
-                self.db.refresh(user)
-            except SQLAlchemyError as e:
-                self.db.rollback()
-                raise _generate_database_error(e, operation='register_user')
         except ClientError as e:
             raise _generate_cognito_error(e, operation='sign_up')
 
+        cognito_sub = response.get('UserSub')
+
+        if not cognito_sub:
+            logger.error("Cognito sign_up did not return UserSub")
+            raise InternalServerError("Failed to register user")
+        return cognito_sub
+
+    async def create_user(self, name: str, email: str, cognito_sub: str) -> bool:
+        """Insert the user's row unless it already exists; True if this call inserted it.
+
+        Safe to retry and to race: signup follow-up jobs and the on-demand
+        fallback in ``get_current_db_user`` may both call it for the same user.
+        An email already registered to another ``cognito_sub`` is a conflict.
+
+        The insert runs on the threadpool: signup jobs run on the event loop,
+        where a database outage would otherwise stall every in-flight request
+        for the connect timeout on each retry.
+        """
+        return await run_in_threadpool(self._insert_user, name, email, cognito_sub)
+
+    def _insert_user(self, name: str, email: str, cognito_sub: str) -> bool:
+        statement = (
+            insert(User)
+            .values(name=name, email=email, cognito_sub=cognito_sub)
+            .on_conflict_do_nothing(index_elements=[User.cognito_sub])
+            .returning(User.id)
+        )
+        try:
+            inserted = self.db.execute(statement).first() is not None
+            self.db.commit()
+        except IntegrityError as e:
+            # The sub conflict is handled above; the only other unique key is the email.
+            self.db.rollback()
+            raise ConflictError("Email is already registered to another account") from e
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise _generate_database_error(e, operation='create_user')
+        return inserted
+
     async def login(self, email: str, password: str):
         try:
             response = self.cognito.initiate_auth(
@@ -111,7 +138,12 @@ class AuthRepository:
             raise _generate_cognito_error(e, operation='initiate_auth[refresh]')
 
     async def get_user_by_cognito_sub(self, cognito_sub: str) -> User | None:
-        return self.db.query(User).filter(User.cognito_sub == cognito_sub).first()
+        return (
+            self.db.query(User)
+            .filter(User.cognito_sub == cognito_sub)
+            .execution_options(read_replica=True)
+            .first()
+        )
 
     @staticmethod
     def _get_tokens_from_response(response: dict[str, Any]) -> dict[str, Any]:
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING
 from fastapi import APIRouter, Depends, Response, Cookie
 
 from app.auth import schemas
-from app.auth.deps import get_auth_service
+from app.auth.deps import get_auth_service, get_current_db_user
 from app.core.entities.auth_user import AuthUser
 from app.core.middleware.auth_user import get_current_user
 
@@ -58,11 +58,8 @@ async def refresh_user_token(
 async def get_current_user(
         response: Response,
         current_user: AuthUser = Depends(get_current_user),
-        service: "AuthService" = Depends(get_auth_service),
+        database_user: schemas.UserRead = Depends(get_current_db_user),
 ):
-    database_user = await service.get_user_by_cognito_sub(current_user.sub)
-    database_user.email_verified = current_user.email_verified
-
     response.set_cookie(key='user_cognito_sub', value=current_user.sub, **cookie_params)
     return database_user
 
@@ -1,13 +1,37 @@
+import logging
+
+from redis import Redis
+
 from app.auth import schemas, AuthRepository
+from app.auth.signup import queue_signup_follow_up
 from app.core.exceptions import NotFoundError
+from app.core.lru import TTLCache
+from app.core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_TTL = 3600
+# Per-worker copies can't be invalidated from other workers, so they live much shorter than Redis entries.
+LOCAL_USER_CACHE_TTL = 60
+LOCAL_USER_CACHE_SIZE = 1024
+
+_local_users: TTLCache[schemas.UserRead] = TTLCache(maxsize=LOCAL_USER_CACHE_SIZE, ttl=LOCAL_USER_CACHE_TTL)
+
+
+def user_cache_key(cognito_sub: str) -> str:
+    return f'user:{cognito_sub}'
 
 
 class AuthService:
-    def __init__(self, auth_repo: AuthRepository):
+    def __init__(self, auth_repo: AuthRepository, redis_client: Redis | None = None):
         self.auth_repo = auth_repo
+        self.redis = redis_client
 
     async def register_user(self, user: schemas.UserCreate) -> schemas.RegistrationSuccess:
-        await self.auth_repo.register_user(email=str(user.email), name=user.name, password=user.password)
+        email = str(user.email)
+        cognito_sub = await self.auth_repo.register_user(email=email, name=user.name, password=user.password)
+        if not queue_signup_follow_up(user.name, email, cognito_sub):
+            await self.auth_repo.create_user(name=user.name, email=email, cognito_sub=cognito_sub)
         return schemas.RegistrationSuccess()
 
     async def login(self, credentials: schemas.UserLogin) -> schemas.AuthTokens:
@@ -26,7 +50,37 @@ class AuthService:
         return schemas.AuthTokens.model_validate(tokens)
 
     async def get_user_by_cognito_sub(self, cognito_sub: str) -> schemas.UserRead:
-        user = await self.auth_repo.get_user_by_cognito_sub(cognito_sub)
-        if not user:
+        """The user's row, served from the worker's LRU, then Redis (when given), then Postgres.
+
+        Only found users are cached; a missing row is looked up again next time.
+        """
+        user = _local_users.get(cognito_sub)
+        record_cache_lookup('user_local', 'hit' if user is not None else 'miss')
+        if user is not None:
+            return user.model_copy()
+
+        if self.redis is not None:
+            try:
+                cached_user = self.redis.get(user_cache_key(cognito_sub))
+                if cached_user:
+                    record_cache_lookup('user', 'hit')
+                    user = schemas.UserRead.model_validate_json(cached_user)
+                    _local_users.set(cognito_sub, user)
+                    return user.model_copy()
+                record_cache_lookup('user', 'miss')
+            except Exception as e:
+                record_cache_lookup('user', 'error')
+                logger.error(f"Redis error: {e}")
+
+        database_user = await self.auth_repo.get_user_by_cognito_sub(cognito_sub)
+        if not database_user:
             raise NotFoundError("User not found")
-        return schemas.UserRead.model_validate(user)
+        user = schemas.UserRead.model_validate(database_user)
+
+        _local_users.set(cognito_sub, user)
+        if self.redis is not None:
+            try:
+                self.redis.set(user_cache_key(cognito_sub), user.model_dump_json(), ex=USER_CACHE_TTL)
+            except Exception as e:
+                logger.error(f"Redis error: {e}")
+        return user.model_copy()
@@ -0,0 +1,36 @@
+"""Follow-up work after a Cognito sign-up, run off the request path.
+
+The signup response waits only for Cognito. Writing the local ``users`` row
+is queued on the background worker, which retries it through short database
+outages; ``get_current_db_user`` inserts the row on demand if every attempt
+failed, so a Cognito user never stays without one.
+"""
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from app.auth.repository import AuthRepository
+from app.core.background import Job, background
+from app.core.cognito import get_cognito_client
+from app.core.database import SessionLocal
+from app.core.exceptions import ConflictError
+
+logger = logging.getLogger(__name__)
+
+
+async def provision_user(name: str, email: str, cognito_sub: str) -> None:
+    database = SessionLocal()
+    try:
+        if not await AuthRepository(get_cognito_client(), database).create_user(name, email, cognito_sub):
+            logger.info("User %s was already provisioned", cognito_sub)
+    except ConflictError as e:
+        # Retrying cannot help; the user gets the same conflict from ``get_current_db_user``.
+        logger.warning("User %s was not provisioned: %s", cognito_sub, e)
+    finally:
+        # Returning the connection to the pool resets it, which is a round trip too.
+        await run_in_threadpool(database.close)
+
+
+def queue_signup_follow_up(name: str, email: str, cognito_sub: str) -> bool:
+    """Queue the post-signup jobs; False if the queue couldn't take them and the caller must run them."""
+    return background.submit(Job('provision_user', lambda: provision_user(name, email, cognito_sub)))
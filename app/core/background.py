@@ -0,0 +1,111 @@
+"""A bounded in-process queue for follow-up work that should not hold up a response.
+
+Jobs run on a few asyncio tasks started by the lifespan. A failing job is
+retried with capped exponential backoff and jitter; after its last attempt it
+is logged and dropped. The queue lives in the worker process, so jobs still
+queued when a worker dies are lost: callers keep anything that must happen
+recoverable (idempotent jobs, or a fallback on the next read).
+"""
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.core.metrics import BACKGROUND_JOBS, BACKGROUND_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    name: str
+    run: Callable[[], Awaitable[None]]
+
+
+class BackgroundWorker:
+    def __init__(
+            self,
+            queue_size: int,
+            concurrency: int,
+            max_attempts: int,
+            retry_base_seconds: float,
+            retry_max_seconds: float,
+    ):
+        self.queue_size = queue_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._queue: asyncio.Queue[Job] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def submit(self, job: Job) -> bool:
+        """Queue ``job``; False when the worker isn't running or the queue is full, so the caller runs it inline."""
+        if not self.running:
+            return False
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            BACKGROUND_JOBS.labels(job=job.name, outcome='rejected').inc()
+            logger.warning("Background queue full; %s not queued", job.name)
+            return False
+        BACKGROUND_QUEUE_DEPTH.inc()
+        return True
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+
+    async def stop(self, drain_seconds: float) -> None:
+        """Give queued jobs up to ``drain_seconds`` to finish, then cancel the rest."""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_seconds)
+        except asyncio.TimeoutError:
+            logger.warning("Background queue not drained on shutdown; %d jobs dropped", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        BACKGROUND_QUEUE_DEPTH.dec(self._queue.qsize())
+        self._tasks = []
+
+    async def _consume(self) -> None:
+        while True:
+            job = await self._queue.get()
+            BACKGROUND_QUEUE_DEPTH.dec()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await job.run()
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    BACKGROUND_JOBS.labels(job=job.name, outcome='failed').inc()
+                    logger.error(f"Background job {job.name} failed after {attempt} attempts: {e}")
+                    return
+                BACKGROUND_JOBS.labels(job=job.name, outcome='retry').inc()
+                delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (attempt - 1))
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            else:
+                BACKGROUND_JOBS.labels(job=job.name, outcome='success').inc()
+                return
+
+
+background = BackgroundWorker(
+    queue_size=settings.BACKGROUND_QUEUE_SIZE,
+    concurrency=settings.BACKGROUND_CONCURRENCY,
+    max_attempts=settings.BACKGROUND_MAX_ATTEMPTS,
+    retry_base_seconds=settings.BACKGROUND_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.BACKGROUND_RETRY_MAX_SECONDS,
+)
@@ -0,0 +1,119 @@
+"""Per-dependency circuit breakers, so an outage costs callers a fast failure instead of a timeout.
+
+A breaker opens after ``BREAKER_FAILURE_THRESHOLD`` consecutive failures and
+rejects calls for ``BREAKER_RESET_SECONDS``; then one trial call is let
+through (half-open) and its outcome closes or re-opens it. Breakers are per
+worker process and thread-safe, since Cognito and S3 calls run on the
+threadpool.
+"""
+import logging
+import threading
+import time
+from enum import IntEnum
+
+from botocore.client import BaseClient
+
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableError
+from app.core.metrics import CIRCUIT_BREAKER_REJECTIONS, CIRCUIT_BREAKER_STATE
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(IntEnum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._trial_started_at = 0.0
+        self._lock = threading.Lock()
+        CIRCUIT_BREAKER_STATE.labels(breaker=name).set(BreakerState.CLOSED)
+
+    @property
+    def state(self) -> BreakerState:
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead; counts a rejection when it may not."""
+        with self._lock:
+            if self._state == BreakerState.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self._set_state(BreakerState.HALF_OPEN)
+            if self._state == BreakerState.CLOSED:
+                return True
+            if self._state == BreakerState.HALF_OPEN:
+                now = time.monotonic()
+                # A trial whose outcome was never recorded must not wedge the breaker half-open.
+                if not self._trial_in_flight or now - self._trial_started_at >= self.reset_seconds:
+                    self._trial_in_flight = True
+                    self._trial_started_at = now
+                    return True
+        CIRCUIT_BREAKER_REJECTIONS.labels(breaker=self.name).inc()
+        return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != BreakerState.CLOSED:
+                logger.info("Circuit breaker %s closed", self.name)
+                self._set_state(BreakerState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == BreakerState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != BreakerState.OPEN:
+                    logger.warning("Circuit breaker %s opened after %d failures", self.name, self._failures)
+                self._opened_at = time.monotonic()
+                self._set_state(BreakerState.OPEN)
+
+    def _set_state(self, state: BreakerState) -> None:
+        self._state = state
+        CIRCUIT_BREAKER_STATE.labels(breaker=self.name).set(state)
+
+
+def _breaker(name: str) -> CircuitBreaker:
+    return CircuitBreaker(name, settings.BREAKER_FAILURE_THRESHOLD, settings.BREAKER_RESET_SECONDS)
+
+
+cognito_breaker = _breaker('cognito')
+s3_breaker = _breaker('s3')
+redis_breaker = _breaker('redis')
+
+
+def guard_boto_client(client: BaseClient, breaker: CircuitBreaker) -> BaseClient:
+    """Fail ``client``'s API calls fast with a 503 while ``breaker`` is open.
+
+    Timeouts, connection errors and 5xx responses (after botocore's own
+    retries) count as failures; other 4xx responses mean the service is up.
+    Presigning makes no API call and is never affected.
+    """
+
+    def _before_call(**_):
+        if not breaker.allow():
+            raise ServiceUnavailableError(f'{breaker.name} is temporarily unavailable')
+
+    def _after_call(http_response, **_):
+        if http_response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def _after_call_error(**_):
+        breaker.record_failure()
+
+    client.meta.events.register('before-call', _before_call)
+    client.meta.events.register('after-call', _after_call)
+    client.meta.events.register('after-call-error', _after_call_error)
+    return client
@@ -0,0 +1,54 @@
+"""CloudFront signed cookies, granting a viewer temporary access to a path prefix.
+
+Requires the optional ``cryptography`` package and a CloudFront key pair
+(``CLOUDFRONT_KEY_PAIR_ID`` / ``CLOUDFRONT_PRIVATE_KEY_PATH``). One signature
+covers every segment under the prefix, which presigned URLs cannot do for HLS
+playlists that reference their segments relatively.
+"""
+import base64
+import json
+from functools import lru_cache
+
+from app.core.config import settings
+from app.core.exceptions import InternalServerError
+
+try:
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+except ImportError:  # signed cookies are optional
+    serialization = None
+
+
+def signed_cookies_enabled() -> bool:
+    return bool(
+        settings.CLOUDFRONT_KEY_PAIR_ID
+        and settings.CLOUDFRONT_PRIVATE_KEY_PATH
+        and settings.PROCESSED_VIDEOS_CDN_BASE_URL
+    )
+
+
+def signed_cookies(resource: str, expires_at: int) -> dict[str, str]:
+    """``CloudFront-*`` cookies for a custom policy allowing ``resource`` (may end in ``*``) until ``expires_at``."""
+    policy = json.dumps(
+        {'Statement': [{'Resource': resource, 'Condition': {'DateLessThan': {'AWS:EpochTime': expires_at}}}]},
+        separators=(',', ':'),
+    ).encode()
+    # CloudFront only accepts SHA1 RSA signatures for signed cookies and URLs.
+    signature = _private_key().sign(policy, padding.PKCS1v15(), hashes.SHA1())
+    return {
+        'CloudFront-Policy': _cloudfront_b64(policy),
+        'CloudFront-Signature': _cloudfront_b64(signature),
+        'CloudFront-Key-Pair-Id': settings.CLOUDFRONT_KEY_PAIR_ID,
+    }
+
+
+@lru_cache(maxsize=1)
+def _private_key():
+    if serialization is None:
+        raise InternalServerError('CloudFront signing requires the cryptography package')
+    with open(settings.CLOUDFRONT_PRIVATE_KEY_PATH, 'rb') as key_file:
+        return serialization.load_pem_private_key(key_file.read(), password=None)
+
+
+def _cloudfront_b64(data: bytes) -> str:
+    return base64.b64encode(data).decode().translate(str.maketrans('+=/', '-_~'))
@@ -1,12 +1,54 @@
+import threading
+
 import boto3
 from botocore.client import BaseClient
+from botocore.config import Config
 
+from app.core.circuit_breaker import CircuitBreaker, cognito_breaker, guard_boto_client, s3_breaker
 from app.core.config import settings
+from app.core.metrics import instrument_boto_client_metrics
+from app.core.timing import instrument_boto_client
+
+# boto3 clients are thread-safe once built, but building one loads the service
+# model and sets up a connection pool, so each is created once per worker.
+_clients: dict[str, BaseClient] = {}
+_clients_lock = threading.Lock()
+
+
+def _get_client(service_name: str, metrics_name: str, timeout: float, breaker: CircuitBreaker) -> BaseClient:
+    client = _clients.get(service_name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(service_name)
+            if client is None:
+                client = boto3.client(
+                    service_name,
+                    region_name=settings.REGION_NAME,
+                    config=Config(
+                        max_pool_connections=settings.AWS_MAX_POOL_CONNECTIONS,
+                        connect_timeout=timeout,
+                        read_timeout=timeout,
+                        retries={'max_attempts': settings.AWS_MAX_ATTEMPTS, 'mode': 'standard'},
+                    ),
+                )
+                instrument_boto_client_metrics(instrument_boto_client(client), service=metrics_name)
+                guard_boto_client(client, breaker)
+                _clients[service_name] = client
+    return client
 
 
 def get_cognito_client() -> BaseClient:
-    return boto3.client('cognito-idp', region_name=settings.REGION_NAME)
+    return _get_client(
+        'cognito-idp', metrics_name='cognito', timeout=settings.COGNITO_TIMEOUT_SECONDS, breaker=cognito_breaker
+    )
 
 
 def get_s3_client() -> BaseClient:
-    return boto3.client('s3', region_name=settings.REGION_NAME)
+    return _get_client('s3', metrics_name='s3', timeout=settings.S3_TIMEOUT_SECONDS, breaker=s3_breaker)
+
+
+def close_clients() -> None:
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,80 @@
+import zlib
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Server preference when the client accepts several encodings equally.
+SUPPORTED_ENCODINGS: tuple[str, ...] = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# Responses compressed per request use cheap levels; bodies compressed once and
+# cached can afford the slower, denser settings.
+_GZIP_LEVELS = {False: 6, True: 9}
+_BROTLI_QUALITIES = {False: 4, True: 9}
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the best supported content-coding from an Accept-Encoding header, or None for identity."""
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[coding.strip().lower()] = quality
+
+    wildcard = weights.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for encoding in SUPPORTED_ENCODINGS:
+        quality = weights.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, *, cached: bool = False) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=_BROTLI_QUALITIES[cached])
+    compressor = zlib.compressobj(_GZIP_LEVELS[cached], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+def encode_variants(body: bytes) -> dict[str, bytes]:
+    """The identity body plus one compressed copy per supported encoding, for caching.
+
+    Bodies below ``COMPRESSION_MINIMUM_SIZE`` are only stored as identity,
+    matching what the middleware would send for them.
+    """
+    variants = {'identity': body}
+    if len(body) >= settings.COMPRESSION_MINIMUM_SIZE:
+        for encoding in SUPPORTED_ENCODINGS:
+            variants[encoding] = compress(body, encoding, cached=True)
+    return variants
+
+
+class StreamCompressor:
+    """Incremental compressor for streaming response bodies."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=_BROTLI_QUALITIES[False])
+        else:
+            self._compressor = zlib.compressobj(_GZIP_LEVELS[False], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes, *, final: bool) -> bytes:
+        if self.encoding == 'br':
+            data = self._compressor.process(chunk)
+            return data + self._compressor.finish() if final else data
+        data = self._compressor.compress(chunk)
+        return data + self._compressor.flush() if final else data
@@ -1,10 +1,168 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncio
+import itertools
+import logging
+from contextvars import ContextVar, Token
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from starlette.concurrency import run_in_threadpool
 
 from .config import settings
+from .metrics import DB_REPLICA_HEALTHY, instrument_engine_pool
+from .timing import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+
+def _create_engine(url: str) -> Engine:
+    return create_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+
+
+engine = _create_engine(settings.POSTGRES_DATABASE_URL)
+instrument_engine(engine)
+instrument_engine_pool(engine)
+
+# Zero on a primary (not in recovery) and on a replica that has replayed everything it received.
+_REPLICA_LAG_QUERY = text(
+    'SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END'
+)
+
+
+class ReplicaSet:
+    """Read replicas handed out round-robin, skipping those the last health check found unusable."""
+
+    def __init__(self, engines: list[Engine]):
+        self.engines = engines
+        self._healthy = list(engines)
+        self._turn = itertools.count()
+        for replica in engines:
+            instrument_engine(replica)
+            event.listen(replica, 'handle_error', self._on_error)
+
+    def choose(self) -> Engine | None:
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    def check(self) -> None:
+        """Ping every replica and measure its lag; blocking, so run it off the event loop."""
+        healthy = []
+        for replica in self.engines:
+            usable = self._is_usable(replica)
+            DB_REPLICA_HEALTHY.labels(replica=_replica_label(replica)).set(int(usable))
+            if usable:
+                healthy.append(replica)
+        self._healthy = healthy
+
+    def mark_down(self, replica: Engine) -> None:
+        if replica in self._healthy:
+            logger.warning("Read replica %s marked down until the next health check", _replica_label(replica))
+            self._healthy = [engine for engine in self._healthy if engine is not replica]
+            DB_REPLICA_HEALTHY.labels(replica=_replica_label(replica)).set(0)
+
+    @staticmethod
+    def _is_usable(replica: Engine) -> bool:
+        try:
+            with replica.connect() as connection:
+                lag = float(connection.execute(_REPLICA_LAG_QUERY).scalar_one())
+        except SQLAlchemyError as e:
+            logger.warning(f"Read replica {_replica_label(replica)} failed its health check: {e}")
+            return False
+        if lag > settings.DB_REPLICA_MAX_LAG_SECONDS:
+            logger.warning("Read replica %s is %.1fs behind the primary", _replica_label(replica), lag)
+            return False
+        return True
+
+    def _on_error(self, exception_context) -> None:
+        if exception_context.is_disconnect or exception_context.connection is None:
+            self.mark_down(exception_context.engine)
+
+
+def _replica_label(replica: Engine) -> str:
+    return f'{replica.url.host}:{replica.url.port or 5432}'
+
+
+replicas = ReplicaSet([_create_engine(url) for url in settings.POSTGRES_REPLICA_URLS])
+
+
+async def run_replica_health_checks(interval: float) -> None:
+    """Re-check the replicas every ``interval`` seconds until cancelled."""
+    while True:
+        await run_in_threadpool(replicas.check)
+        await asyncio.sleep(interval)
+
 
-engine = create_engine(settings.POSTGRES_DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class ReadRouting:
+    """Per-request routing state: whether reads are pinned to the primary, and whether the request wrote."""
+
+    __slots__ = ('pinned', 'wrote')
+
+    def __init__(self, pinned: bool):
+        self.pinned = pinned
+        self.wrote = False
+
+
+_current_routing: ContextVar[ReadRouting | None] = ContextVar('read_routing', default=None)
+
+
+def start_read_routing(pinned: bool) -> tuple[ReadRouting, Token]:
+    routing = ReadRouting(pinned)
+    return routing, _current_routing.set(routing)
+
+
+def stop_read_routing(token: Token) -> None:
+    _current_routing.reset(token)
+
+
+class RoutingSession(Session):
+    """Sends statements marked ``read_replica`` to a replica and everything else to the primary.
+
+    Repository methods opt in with ``.execution_options(read_replica=True)``
+    on queries that tolerate replication lag. A session sticks to the first
+    replica it picks so a request holds at most one replica connection, and
+    once it (or its request) has written, every later read goes to the
+    primary so it sees its own writes.
+    """
+
+    _replica: Engine | None = None
+    _wrote: bool = False
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        routing = _current_routing.get()
+        if _is_write(clause) or self._flushing:
+            self._wrote = True
+            if routing is not None:
+                routing.wrote = True
+            return engine
+
+        if (
+            clause is not None
+            and clause.get_execution_options().get('read_replica')
+            and not self._wrote
+            and not (routing is not None and (routing.pinned or routing.wrote))
+        ):
+            if self._replica is None:
+                self._replica = replicas.choose()
+            if self._replica is not None:
+                return self._replica
+        return engine
+
+
+def _is_write(clause) -> bool:
+    # ``select(Model).from_statement(insert(...))`` wraps the DML it executes.
+    return bool(getattr(clause, 'is_dml', False) or getattr(getattr(clause, 'element', None), 'is_dml', False))
+
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
@@ -19,3 +177,17 @@ def get_db():
 
 def init_db():
     Base.metadata.create_all(engine)
+
+
+def warm_pool(connections: int) -> None:
+    """Open up to ``connections`` pooled connections so first requests skip the connect handshake."""
+    opened = []
+    try:
+        for _ in range(min(connections, settings.DB_POOL_SIZE)):
+            connection = engine.connect()
+            connection.execute(text('SELECT 1'))
+            opened.append(connection)
+    finally:
+        for connection in opened:
+            connection.close()
+    logger.info("Warmed %d database connections", len(opened))
@@ -4,9 +4,11 @@ from fastapi import HTTPException
 from fastapi import Request, status, FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from redis import exceptions as redis_exceptions
 
 from app.core.error_response import ErrorResponse
 from app.core.exceptions import AppError
+from app.core.metrics import APP_ERRORS
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +16,7 @@ logger = logging.getLogger(__name__)
 def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(RequestValidationError)
     async def _on_validation_error(request: Request, exc: RequestValidationError):
-        logger.warning("422 %s %s :: %s", request.method, request.url, exc.errors())
+        logger.warning("422 %s %s :: %s", request.method, request.url.path, exc.errors())
         return JSONResponse(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             content=ErrorResponse(error="Invalid input", details=exc.errors()).model_dump(),
@@ -22,15 +24,27 @@ def register_exception_handlers(app: FastAPI) -> None:
 
     @app.exception_handler(AppError)
     async def _on_app_error(request: Request, exc: AppError):
-        logger.error("AppError %s %s :: %s", request.method, request.url, exc.detail)
+        logger.error("AppError %s %s :: %s", request.method, request.url.path, exc.detail)
+        APP_ERRORS.labels(error_code=exc.error_code or str(exc.status_code), status=str(exc.status_code)).inc()
         return JSONResponse(
             status_code=exc.status_code,
             content=ErrorResponse(error=exc.error_code or str(exc.status_code), details=exc.detail).model_dump(),
         )
 
+    @app.exception_handler(redis_exceptions.ConnectionError)
+    @app.exception_handler(redis_exceptions.TimeoutError)
+    async def _on_redis_unavailable(request: Request, exc: redis_exceptions.RedisError):
+        # Reads fall back to Postgres; only operations that need Redis get here.
+        logger.error("Redis unavailable %s %s :: %s", request.method, request.url.path, exc)
+        APP_ERRORS.labels(error_code='SERVICE_UNAVAILABLE', status='503').inc()
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=ErrorResponse(error='SERVICE_UNAVAILABLE', details='Service temporarily unavailable').model_dump(),
+        )
+
     @app.exception_handler(HTTPException)
     async def _on_http_exc(request: Request, exc: HTTPException):
-        logger.warning("HTTPException %s %s :: %s", request.method, request.url, exc.detail)
+        logger.warning("HTTPException %s %s :: %s", request.method, request.url.path, exc.detail)
         return JSONResponse(
             status_code=exc.status_code,
             content=ErrorResponse(error=str(exc.detail)).model_dump(),
@@ -38,7 +52,8 @@ def register_exception_handlers(app: FastAPI) -> None:
 
     @app.exception_handler(Exception)
     async def _on_uncaught(request: Request, exc: Exception):
-        logger.critical("Unhandled %s %s", request.method, request.url, exc_info=True)
+        logger.critical("Unhandled %s %s", request.method, request.url.path, exc_info=True)
+        APP_ERRORS.labels(error_code='UNHANDLED', status='500').inc()
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content=ErrorResponse(error="Internal Server Error").model_dump(),
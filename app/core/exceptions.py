@@ -29,6 +29,11 @@ class ConflictError(AppError):
         super().__init__(message, status_code=409)
 
 
+class ServiceUnavailableError(AppError):
+    def __init__(self, message: str = 'Service temporarily unavailable', error_code: str = 'SERVICE_UNAVAILABLE'):
+        super().__init__(message, status_code=503, error_code=error_code)
+
+
 class InternalServerError(AppError):
     def __init__(self, message="Something went wrong", error_code: str | None = None):
         super().__init__(message, status_code=500, error_code=error_code)
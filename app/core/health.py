@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+router = APIRouter(prefix='/health', tags=['ops'])
+
+
+@router.get('/live', include_in_schema=False)
+async def liveness():
+    """The process is up and serving the event loop."""
+    return {'status': 'ok'}
+
+
+@router.get('/ready', include_in_schema=False)
+async def readiness(request: Request):
+    """The worker finished startup warm-up and can take traffic."""
+    if not getattr(request.app.state, 'ready', False):
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={'status': 'starting'})
+    return {'status': 'ready'}
@@ -0,0 +1,65 @@
+from fastapi import Response, status
+
+from app.core.config import settings
+
+PUBLIC_CACHE_CONTROL = (
+    f'public, max-age={settings.PUBLIC_CACHE_MAX_AGE}, '
+    f'stale-while-revalidate={settings.PUBLIC_CACHE_STALE_WHILE_REVALIDATE}'
+)
+PRIVATE_CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag built from values that change whenever the representation does."""
+    return '"' + '.'.join(str(part) for part in parts) + '"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of the ``encoding``-compressed variant; a strong ETag must differ per content-coding."""
+    if etag.startswith('W/') or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x", and every
+    # content-coding of a representation revalidates against the same version.
+    return any(
+        _strip_encoding(candidate.strip().removeprefix('W/')) == etag
+        for candidate in if_none_match.split(',')
+    )
+
+
+def _strip_encoding(etag: str) -> str:
+    for encoding in ('br', 'gzip'):
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
+
+
+def encoded_json_response(body: bytes, encoding: str | None, etag: str | None, cache_control: str) -> Response:
+    """Response for a JSON body that was serialised (and possibly compressed) ahead of time."""
+    response = Response(content=body, media_type='application/json')
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Vary'] = 'Accept-Encoding'
+    if encoding is not None:
+        response.headers['Content-Encoding'] = encoding
+    if etag is not None:
+        response.headers['ETag'] = encoded_etag(etag, encoding) if encoding else etag
+    return response
@@ -0,0 +1,84 @@
+import asyncio
+import contextlib
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+
+from app.core.background import background
+from app.core.cognito import close_clients, get_cognito_client, get_s3_client
+from app.core.config import settings
+from app.core.database import engine, replicas, run_replica_health_checks, warm_pool
+from app.core.metrics import MULTIPROCESS_ENABLED
+from app.core.redis import close_redis_client, get_redis_client
+from app.core.security import prime_secret_hash
+from app.video.cleanup import run_cleanup_scheduler
+from app.video.views import run_view_flusher
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up() -> None:
+    get_cognito_client()
+    get_s3_client()
+    prime_secret_hash(settings.COGNITO_CLIENT_SECRET)
+
+    # Pings Redis; an unreachable server is logged there and callers fall back until it is back.
+    get_redis_client()
+
+    if settings.WARMUP_DB_CONNECTIONS:
+        try:
+            warm_pool(settings.WARMUP_DB_CONNECTIONS)
+        except Exception:
+            logger.warning("Database warm-up failed; connections will be opened on demand", exc_info=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Builds the worker's shared clients once, optionally warms them, and tears them down on shutdown."""
+    app.state.ready = False
+    if settings.WARMUP_ON_STARTUP:
+        await run_in_threadpool(_warm_up)
+    background.start()
+    replica_checker = None
+    if replicas.engines:
+        replica_checker = asyncio.create_task(run_replica_health_checks(settings.DB_REPLICA_HEALTH_CHECK_SECONDS))
+    view_flusher = None
+    if settings.VIEW_FLUSH_INTERVAL_SECONDS:
+        view_flusher = asyncio.create_task(run_view_flusher(settings.VIEW_FLUSH_INTERVAL_SECONDS))
+    cleanup_scheduler = None
+    if settings.CLEANUP_INTERVAL_SECONDS:
+        cleanup_scheduler = asyncio.create_task(run_cleanup_scheduler(settings.CLEANUP_INTERVAL_SECONDS))
+    app.state.ready = True
+    logger.info("Worker %s ready", os.getpid())
+
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        await background.stop(settings.BACKGROUND_DRAIN_SECONDS)
+        if view_flusher is not None:
+            # Cancelling runs one last flush so buffered views survive a deploy.
+            view_flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await view_flusher
+        # An interrupted cleanup pass is safe to abandon; the next run picks up where it stopped.
+        if cleanup_scheduler is not None:
+            cleanup_scheduler.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await cleanup_scheduler
+        if replica_checker is not None:
+            replica_checker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await replica_checker
+        close_clients()
+        close_redis_client()
+        engine.dispose()
+        for replica in replicas.engines:
+            replica.dispose()
+        if MULTIPROCESS_ENABLED:
+            from prometheus_client import multiprocess
+
+            multiprocess.mark_process_dead(os.getpid())
@@ -1,5 +1,13 @@
+import atexit
 import logging
 import logging.config
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import settings
+
+ACCESS_LOGGER = "app.core.middleware.access_log"
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -12,7 +20,7 @@ LOGGING_CONFIG = {
             "format": "%(levelname)s [%(asctime)s] %(name)s (%(filename)s:%(lineno)d) - %(message)s",
         },
         "json": {
-            "()": "pythonjsonlogger.jsonlogger.JsonFormatter",
+            "()": "pythonjsonlogger.json.JsonFormatter",
             "fmt": "%(levelname)s %(asctime)s %(name)s %(message)s",
         },
     },
@@ -22,6 +30,11 @@ LOGGING_CONFIG = {
             "formatter": "default",
             "level": "DEBUG",
         },
+        "access": {
+            "class": "logging.StreamHandler",
+            "formatter": "json",
+            "level": "DEBUG",
+        },
     },
     "root": {
         "handlers": ["console"],
@@ -32,10 +45,72 @@ LOGGING_CONFIG = {
         "uvicorn.error": {"level": "INFO"},
         "uvicorn.access": {"level": "INFO"},
         "sqlalchemy.engine": {"level": "WARNING"},
+        ACCESS_LOGGER: {"handlers": ["access"], "level": "INFO", "propagate": False},
     },
 }
 
+_listeners: list[QueueListener] = []
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random ``rate`` fraction of INFO-and-below records; warnings and errors always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.INFO or random.random() < self.rate
+
+
+class _InProcessQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
 
-def setup_logging():
-    """Initialise logging with our config"""
+    The stock ``prepare`` formats the record on the calling thread so it can be
+    pickled; our queue never leaves the process, so the record is handed over
+    untouched and all formatting happens in the background.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(use_queue: bool = True):
+    """Initialise logging with our config.
+
+    With ``use_queue`` (the default) every configured handler is moved behind a
+    QueueListener so request handlers only pay for an in-memory enqueue; the
+    actual formatting and writes happen on a background thread.
+    """
+    stop_logging()
     logging.config.dictConfig(LOGGING_CONFIG)
+
+    for name, rate in settings.LOG_SAMPLING.items():
+        logger = logging.getLogger(name)
+        logger.filters = [f for f in logger.filters if not isinstance(f, SamplingFilter)]
+        if rate < 1:
+            logger.addFilter(SamplingFilter(rate))
+
+    if not use_queue:
+        return
+
+    for logger in (logging.getLogger(), logging.getLogger(ACCESS_LOGGER)):
+        handlers = list(logger.handlers)
+        if not handlers:
+            continue
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(_InProcessQueueHandler(log_queue))
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _listeners.append(listener)
+
+
+def stop_logging():
+    """Flush and stop the background log listeners, if any are running."""
+    while _listeners:
+        _listeners.pop().stop()
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,170 @@
+import os
+import time
+
+from botocore.client import BaseClient
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Multiprocess mode is enabled by exporting PROMETHEUS_MULTIPROC_DIR before the
+# workers start; each worker then writes its samples to mmap files in that
+# directory and /metrics aggregates them on scrape.
+MULTIPROCESS_ENABLED = bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Time spent handling HTTP requests, by templated route.',
+    ['method', 'route', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress',
+    'HTTP requests currently being handled.',
+    ['method'],
+    multiprocess_mode='livesum',
+)
+APP_ERRORS = Counter(
+    'app_errors_total',
+    'Errors returned to clients, by AppError error code.',
+    ['error_code', 'status'],
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total',
+    'Cache lookups by cache name and result (hit / miss / error).',
+    ['cache', 'result'],
+)
+DB_POOL_SIZE = Gauge(
+    'db_pool_size',
+    'Configured SQLAlchemy pool size.',
+    multiprocess_mode='livesum',
+)
+DB_POOL_CONNECTIONS = Gauge(
+    'db_pool_connections_open',
+    'Database connections currently open.',
+    multiprocess_mode='livesum',
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_connections_checked_out',
+    'Database connections currently checked out of the pool.',
+    multiprocess_mode='livesum',
+)
+DB_REPLICA_HEALTHY = Gauge(
+    'db_replica_healthy',
+    'Whether the last health check found the read replica usable (1) or not (0).',
+    ['replica'],
+    multiprocess_mode='min',
+)
+AWS_REQUEST_DURATION = Histogram(
+    'aws_request_duration_seconds',
+    'Latency of AWS API calls (Cognito, S3), by service and operation.',
+    ['service', 'operation', 'outcome'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+ADMISSION_REJECTIONS = Counter(
+    'admission_rejections_total',
+    'Requests shed by the rate limiter (429) or the concurrency cap (503).',
+    ['policy', 'status'],
+)
+CIRCUIT_BREAKER_STATE = Gauge(
+    'circuit_breaker_state',
+    'Circuit breaker state per dependency: 0 closed, 1 half-open, 2 open.',
+    ['breaker'],
+    # Live workers only: a worker that died with its breaker open must not pin the gauge at 2.
+    multiprocess_mode='livemax',
+)
+CIRCUIT_BREAKER_REJECTIONS = Counter(
+    'circuit_breaker_rejections_total',
+    'Calls failed fast because the dependency\'s breaker was open.',
+    ['breaker'],
+)
+BACKGROUND_JOBS = Counter(
+    'background_jobs_total',
+    'Background job attempts by job name and outcome (success / retry / failed / rejected).',
+    ['job', 'outcome'],
+)
+BACKGROUND_QUEUE_DEPTH = Gauge(
+    'background_queue_depth',
+    'Jobs waiting in the background queue.',
+    multiprocess_mode='livesum',
+)
+CLEANUP_DELETED = Counter(
+    'cleanup_deleted_total',
+    'Items removed by the upload cleanup job (videos soft-deleted / orphaned uploads / S3 keys deleted).',
+    ['kind'],
+)
+
+router = APIRouter(tags=['ops'])
+
+
+@router.get('/metrics', include_in_schema=False)
+def metrics() -> Response:
+    if MULTIPROCESS_ENABLED:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def record_cache_lookup(cache: str, result: str, count: int = 1) -> None:
+    if count:
+        CACHE_REQUESTS.labels(cache=cache, result=result).inc(count)
+
+
+def instrument_engine_pool(engine: Engine) -> None:
+    """Track open and checked-out connections of ``engine``'s pool."""
+    pool_size = getattr(engine.pool, 'size', None)
+    if callable(pool_size):
+        DB_POOL_SIZE.set(pool_size())
+
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.inc()
+
+    @event.listens_for(engine, 'close')
+    def _on_close(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.dec()
+
+    @event.listens_for(engine, 'checkout')
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, 'checkin')
+    def _on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+
+
+def instrument_boto_client_metrics(client: BaseClient, service: str) -> BaseClient:
+    """Observe the latency of every API call made by ``client``."""
+
+    def _before_call(model, context, **_):
+        context['_metrics_operation'] = model.name
+        context['_metrics_start'] = time.perf_counter()
+
+    def _after_call(http_response, context, **_):
+        _observe(context, 'error' if http_response.status_code >= 400 else 'success')
+
+    def _after_call_error(context, **_):
+        _observe(context, 'error')
+
+    def _observe(context: dict, outcome: str):
+        start = context.pop('_metrics_start', None)
+        if start is not None:
+            AWS_REQUEST_DURATION.labels(
+                service=service, operation=context['_metrics_operation'], outcome=outcome
+            ).observe(time.perf_counter() - start)
+
+    client.meta.events.register('before-call', _before_call)
+    client.meta.events.register('after-call', _after_call)
+    client.meta.events.register('after-call-error', _after_call_error)
+    return client
@@ -1,3 +1,7 @@
 from app.core.middleware.access_log import AccessLogMiddleware
+from app.core.middleware.compression import CompressionMiddleware
+from app.core.middleware.metrics import MetricsMiddleware
+from app.core.middleware.rate_limit import RateLimitMiddleware
+from app.core.middleware.read_your_writes import ReadYourWritesMiddleware
 
-__all__ = ['AccessLogMiddleware']
+__all__ = ['AccessLogMiddleware', 'CompressionMiddleware', 'MetricsMiddleware', 'RateLimitMiddleware', 'ReadYourWritesMiddleware']
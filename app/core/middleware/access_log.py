@@ -1,8 +1,11 @@
 import logging
 import time
 
+from starlette.datastructures import MutableHeaders
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+from app.core.timing import start_request_timings, stop_request_timings
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,6 +17,7 @@ class AccessLogMiddleware:
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
         start = time.perf_counter()
+        timings, token = start_request_timings()
 
         async def _send(message):
             if message["type"] == "http.response.start":
@@ -21,7 +25,14 @@ class AccessLogMiddleware:
                 method = scope["method"]
                 path = scope["path"]
                 dur_ms = (time.perf_counter() - start) * 1000
-                logger.info("%s %s -> %d in %.1fms", method, path, status_code, dur_ms)
+                fields = {"method": method, "path": path, "status": status_code, "duration_ms": round(dur_ms, 1)}
+                if timings is not None:
+                    MutableHeaders(scope=message).append("Server-Timing", timings.server_timing_header(dur_ms))
+                    fields.update(timings.as_log_fields())
+                logger.info("%s %s -> %d in %.1fms", method, path, status_code, dur_ms, extra=fields)
             await send(message)
 
-        return await self.app(scope, receive, _send)
+        try:
+            return await self.app(scope, receive, _send)
+        finally:
+            stop_request_timings(token)
@@ -1,16 +1,22 @@
+import hashlib
 import logging
 from typing import Optional
 
 from botocore.client import BaseClient
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import Cookie, Depends, Header, HTTPException, status
 
 from app.core.cognito import get_cognito_client
+from app.core.config import settings
 from app.core.entities.auth_user import AuthUser
-from app.core.exceptions import UnauthorizedError
+from app.core.exceptions import ServiceUnavailableError, UnauthorizedError
+from app.core.lru import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Keyed by the SHA-256 of the access token, so raw tokens are never kept around.
+_verified_identities: TTLCache[AuthUser] = TTLCache(maxsize=10000, ttl=settings.IDENTITY_CACHE_TTL)
+
 
 def _get_cognito_user(access_token: str, cognito_client: BaseClient) -> AuthUser:
     try:
@@ -41,10 +47,33 @@ def get_current_user(
         access_token: str = Cookie(None),
         cognito_client: BaseClient = Depends(get_cognito_client),
 ) -> AuthUser:
+    """The caller's Cognito identity.
+
+    While Cognito is unreachable (timeouts, 5xx, open circuit breaker) the
+    identity last verified for the same token stands in for up to
+    ``IDENTITY_CACHE_TTL`` seconds; tokens not seen recently get a fast 503.
+    """
     if not access_token:
         raise UnauthorizedError('User is not authenticated')
 
-    return _get_cognito_user(access_token=access_token, cognito_client=cognito_client)
+    token_key = hashlib.sha256(access_token.encode()).digest()
+    try:
+        user = _get_cognito_user(access_token=access_token, cognito_client=cognito_client)
+    except (BotoCoreError, ClientError, ServiceUnavailableError) as exception:
+        if isinstance(exception, ClientError) and _http_status(exception) < 500:
+            raise
+        cached_user = _verified_identities.get(token_key)
+        if cached_user is None:
+            raise ServiceUnavailableError('Authentication is temporarily unavailable') from exception
+        logger.warning("Cognito unavailable; using the cached identity of %s", cached_user.sub)
+        return cached_user
+
+    _verified_identities.set(token_key, user)
+    return user
+
+
+def _http_status(exception: ClientError) -> int:
+    return exception.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 500)
 
 
 def verify_iam_auth(
@@ -0,0 +1,85 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.compression import StreamCompressor, negotiate_encoding
+from app.core.config import settings
+from app.core.http_cache import encoded_etag
+
+EXCLUDED_CONTENT_TYPES = ('text/event-stream', 'image/', 'video/', 'audio/')
+
+
+class CompressionMiddleware:
+    """Negotiates brotli/gzip for responses of at least ``minimum_size`` bytes.
+
+    Responses that already carry a Content-Encoding (for example bodies served
+    pre-compressed from the cache) pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            return await self.app(scope, receive, send)
+
+        start_message: Message = {}
+        compressor: StreamCompressor | None = None
+        passthrough = False
+
+        async def _send(message: Message):
+            nonlocal start_message, compressor, passthrough
+            message_type = message["type"]
+
+            if message_type == "http.response.start":
+                # Hold the headers back until the first body chunk tells us whether to compress.
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+                )
+                return
+
+            if message_type != "http.response.body":
+                if start_message:
+                    await send(start_message)
+                    start_message = {}
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message:
+                initial, start_message = start_message, {}
+                if passthrough or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(initial)
+                    await send(message)
+                    return
+
+                compressor = StreamCompressor(encoding)
+                headers = MutableHeaders(raw=initial["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                body = compressor.compress(body, final=not more_body)
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                await send(initial)
+                await send({**message, "body": body})
+                return
+
+            if compressor is not None and not passthrough:
+                message = {**message, "body": compressor.compress(body, final=not more_body)}
+            await send(message)
+
+        return await self.app(scope, receive, _send)
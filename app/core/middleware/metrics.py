@@ -0,0 +1,41 @@
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import REQUEST_DURATION, REQUESTS_IN_PROGRESS
+
+
+class MetricsMiddleware:
+    """Records request duration per templated route and in-flight request counts."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def _send(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method=method)
+        in_progress.inc()
+        try:
+            return await self.app(scope, receive, _send)
+        finally:
+            in_progress.dec()
+            # The router stores the matched route on the scope, which gives us the
+            # templated path (``/videos/{video_id}``) rather than the raw one.
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                method=method,
+                route=route.path if route is not None else "unmatched",
+                status=str(status_code),
+            ).observe(time.perf_counter() - start)
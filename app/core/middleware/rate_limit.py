@@ -0,0 +1,96 @@
+import logging
+
+from fastapi import status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.error_response import ErrorResponse
+from app.core.metrics import ADMISSION_REJECTIONS
+from app.core.rate_limit import RateLimiter, RateLimitPolicy, retry_after_header
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/v1'
+
+# Liveness probes and scrapes must keep answering while the worker sheds load.
+EXEMPT_PATHS = frozenset({'/health/live', '/metrics'})
+
+DEFAULT_POLICIES = (
+    RateLimitPolicy(
+        name='login', method='POST', path=f'{API_PREFIX}/auth/login',
+        per_minute=settings.RATE_LIMIT_LOGIN_PER_MINUTE, burst=settings.RATE_LIMIT_LOGIN_BURST,
+    ),
+    RateLimitPolicy(
+        name='signup', method='POST', path=f'{API_PREFIX}/auth/signup',
+        per_minute=settings.RATE_LIMIT_SIGNUP_PER_MINUTE, burst=settings.RATE_LIMIT_SIGNUP_BURST,
+    ),
+    RateLimitPolicy(
+        name='upload_url', method='POST', path=f'{API_PREFIX}/upload/videos/upload-url',
+        per_minute=settings.RATE_LIMIT_UPLOAD_URL_PER_MINUTE, burst=settings.RATE_LIMIT_UPLOAD_URL_BURST,
+    ),
+)
+
+
+class RateLimitMiddleware:
+    """Admission control: a per-worker concurrency cap plus per-route token buckets.
+
+    Requests over ``max_concurrency`` are shed with 503 before they reach the
+    route, so a burst cannot queue unbounded work on the worker. Routes with a
+    policy take a token from a bucket keyed by client IP; an empty bucket
+    answers 429. The cookie is not verified here, so it never picks the
+    bucket: a fresh random cookie per request would otherwise mean a fresh
+    bucket, each request still costing a Cognito call before its 401.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            policies: tuple[RateLimitPolicy, ...] = DEFAULT_POLICIES,
+            max_concurrency: int = settings.MAX_CONCURRENT_REQUESTS,
+            limiter: RateLimiter | None = None,
+    ):
+        self.app = app
+        self.policies = {(policy.method, policy.path): policy for policy in policies}
+        self.max_concurrency = max_concurrency
+        self.limiter = limiter or RateLimiter()
+        self._in_flight = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if scope["path"] in EXEMPT_PATHS:
+            return await self.app(scope, receive, send)
+
+        if self.max_concurrency and self._in_flight >= self.max_concurrency:
+            ADMISSION_REJECTIONS.labels(policy='concurrency', status='503').inc()
+            return await _reject(status.HTTP_503_SERVICE_UNAVAILABLE, 'SERVER_BUSY', 1)(scope, receive, send)
+
+        policy = self.policies.get((scope["method"], scope["path"]))
+        if policy is not None:
+            decision = self.limiter.take(_client_key(scope), policy)
+            if not decision.allowed:
+                ADMISSION_REJECTIONS.labels(policy=policy.name, status='429').inc()
+                return await _reject(
+                    status.HTTP_429_TOO_MANY_REQUESTS, 'RATE_LIMITED', decision.retry_after
+                )(scope, receive, send)
+
+        self._in_flight += 1
+        try:
+            return await self.app(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+
+def _client_key(scope: Scope) -> str:
+    client = scope.get('client')
+    return f'ip:{client[0] if client else "unknown"}'
+
+
+def _reject(status_code: int, error_code: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content=ErrorResponse(error=error_code).model_dump(),
+        headers={'Retry-After': retry_after_header(retry_after)},
+    )
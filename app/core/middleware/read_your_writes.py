@@ -0,0 +1,51 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.database import replicas, start_read_routing, stop_read_routing
+
+PRIMARY_UNTIL_COOKIE = 'db_primary_until'
+
+
+class ReadYourWritesMiddleware:
+    """Keeps a client's reads on the primary for a while after it writes.
+
+    A request that wrote gets a cookie holding the time its pin expires
+    (``DB_READ_YOUR_WRITES_SECONDS`` later); requests carrying an unexpired one
+    skip the replicas, so the client never reads data older than its own writes.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not replicas.engines:
+            return await self.app(scope, receive, send)
+
+        now = time.time()
+        routing, token = start_read_routing(pinned=_pinned_until(scope) > now)
+
+        async def _send(message):
+            if message["type"] == "http.response.start" and routing.wrote:
+                window = settings.DB_READ_YOUR_WRITES_SECONDS
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{PRIMARY_UNTIL_COOKIE}={int(now) + window}; Max-Age={window}; Path=/; "
+                    "HttpOnly; SameSite=none; Secure",
+                )
+            await send(message)
+
+        try:
+            return await self.app(scope, receive, _send)
+        finally:
+            stop_read_routing(token)
+
+
+def _pinned_until(scope: Scope) -> float:
+    try:
+        return float(HTTPConnection(scope).cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+    except ValueError:
+        return 0.0
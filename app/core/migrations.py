@@ -0,0 +1,59 @@
+"""Explicit schema management, run once per deploy instead of on every worker start.
+
+    python -m app.core.migrations
+"""
+import logging
+
+from sqlalchemy import text
+
+from app.core.database import engine, init_db
+from app.core.logging_config import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Idempotent statements for changes ``create_all`` cannot apply to existing
+# tables (new columns, indexes, constraints). Append only; each must be safe
+# to run again.
+MIGRATIONS: list[str] = [
+    "ALTER TABLE videos ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1",
+    "ALTER TABLE videos ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+    # Fails while duplicate keys exist; remove them before deploying.
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_videos_video_s3_key ON videos (video_s3_key)",
+    "ALTER TABLE videos ADD COLUMN IF NOT EXISTS size_bytes BIGINT",
+    "ALTER TABLE videos ADD COLUMN IF NOT EXISTS s3_etag VARCHAR",
+    "ALTER TABLE videos ADD COLUMN IF NOT EXISTS views BIGINT NOT NULL DEFAULT 0",
+    "ALTER TABLE videos ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ",
+    # Keyset scan of the cleanup job; only live, unfinished rows are indexed.
+    "CREATE INDEX IF NOT EXISTS ix_videos_cleanup ON videos (updated_at, id) "
+    "WHERE deleted_at IS NULL AND processing_status IN ('IN_PROGRESS', 'FAILED')",
+    # The public feed, without the soft-deleted and unfinished rows a status filter would wade through.
+    "CREATE INDEX IF NOT EXISTS ix_videos_public_feed ON videos (id) "
+    "WHERE deleted_at IS NULL AND processing_status = 'COMPLETED' AND visibility = 'PUBLIC'",
+    # Existing rows all get the migration time; ties are broken by id.
+    "ALTER TABLE videos ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ NOT NULL DEFAULT now()",
+    # The public feed in creation order, without the soft-deleted and unfinished rows a status filter would wade through.
+    "CREATE INDEX IF NOT EXISTS ix_videos_public_feed_created ON videos (created_at, id) "
+    "WHERE deleted_at IS NULL AND processing_status = 'COMPLETED' AND visibility = 'PUBLIC'",
+    # Rows soft-deleted before this column existed already had their objects removed.
+    "ALTER TABLE videos ADD COLUMN IF NOT EXISTS purge_pending BOOLEAN NOT NULL DEFAULT false",
+    "CREATE INDEX IF NOT EXISTS ix_videos_purge_pending ON videos (deleted_at, id) WHERE purge_pending",
+    # Superseded by ix_videos_public_feed_created once the feed moved to creation order.
+    "DROP INDEX IF EXISTS ix_videos_public_feed",
+]
+
+
+def migrate() -> None:
+    # Importing the models registers their tables on ``Base.metadata``.
+    import app.auth.models  # noqa: F401
+    import app.video.models  # noqa: F401
+
+    init_db()
+    with engine.begin() as connection:
+        for statement in MIGRATIONS:
+            connection.execute(text(statement))
+    logger.info("Schema is up to date (%d migration statements applied)", len(MIGRATIONS))
+
+
+if __name__ == '__main__':
+    setup_logging(use_queue=False)
+    migrate()
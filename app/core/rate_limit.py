@@ -0,0 +1,132 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+
+from redis import exceptions
+
+from app.core.exceptions import AppError
+from app.core.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Token bucket stored as a hash of {tokens, ts}. Refill and take happen in one
+# script so concurrent workers never race on the same bucket; the Redis clock
+# is used so workers with skewed clocks agree on the refill.
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitPolicy:
+    """Token bucket refilled at ``per_minute`` tokens a minute, holding at most ``burst``.
+
+    Buckets are per client IP.
+    """
+
+    name: str
+    method: str
+    path: str
+    per_minute: int
+    burst: int
+
+    @property
+    def rate(self) -> float:
+        return self.per_minute / 60
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    allowed: bool
+    retry_after: float = 0.0
+
+
+class InMemoryTokenBucket:
+    """Per-process token buckets, used when Redis is unavailable."""
+
+    def __init__(self, max_keys: int = 10_000):
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def take(self, key: str, policy: RateLimitPolicy) -> RateLimitDecision:
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(key, (policy.burst, now))
+        tokens = min(policy.burst, tokens + (now - ts) * policy.rate)
+
+        if tokens >= 1:
+            decision = RateLimitDecision(allowed=True)
+            tokens -= 1
+        else:
+            decision = RateLimitDecision(allowed=False, retry_after=(1 - tokens) / policy.rate)
+
+        if len(self._buckets) >= self.max_keys and key not in self._buckets:
+            self._evict(now, policy)
+        self._buckets[key] = (tokens, now)
+        return decision
+
+    def _evict(self, now: float, policy: RateLimitPolicy) -> None:
+        # Buckets that would have refilled completely carry no state worth keeping.
+        full_after = policy.burst / policy.rate
+        stale = [key for key, (_, ts) in self._buckets.items() if now - ts >= full_after]
+        for key in stale or list(self._buckets)[: self.max_keys // 10]:
+            del self._buckets[key]
+
+
+class RateLimiter:
+    """Takes tokens from Redis-backed buckets, falling back to in-memory buckets.
+
+    After a Redis failure the limiter stays on the in-memory buckets for
+    ``redis_retry_seconds`` so an outage does not add a connect timeout to
+    every request.
+    """
+
+    def __init__(self, redis_retry_seconds: float = 5.0):
+        self.redis_retry_seconds = redis_retry_seconds
+        self._fallback = InMemoryTokenBucket()
+        self._script = None
+        self._redis_retry_at = 0.0
+
+    def take(self, key: str, policy: RateLimitPolicy) -> RateLimitDecision:
+        if time.monotonic() < self._redis_retry_at:
+            return self._fallback.take(key, policy)
+
+        try:
+            redis_client = get_redis_client()
+            if self._script is None:
+                self._script = redis_client.register_script(_TOKEN_BUCKET_SCRIPT)
+            allowed, retry_after = self._script(
+                keys=[f'ratelimit:{policy.name}:{key}'],
+                args=[policy.rate, policy.burst],
+                client=redis_client,
+            )
+            return RateLimitDecision(allowed=bool(int(allowed)), retry_after=float(retry_after))
+        except (AppError, exceptions.RedisError) as e:
+            logger.warning("Rate limiter falling back to in-memory buckets: %s", e)
+            self._redis_retry_at = time.monotonic() + self.redis_retry_seconds
+            return self._fallback.take(key, policy)
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
@@ -2,14 +2,80 @@
 import logging
 
 from redis import Redis, exceptions
+from redis.client import Pipeline
 
+from app.core.circuit_breaker import redis_breaker
 from app.core.config import settings
-from app.core.exceptions import InternalServerError
+from app.core.timing import span
 
 logger = logging.getLogger(__name__)
 
-# This will hold the singleton client instance
+
+class TimedPipeline(Pipeline):
+    """Pipeline that records each round trip as a single ``redis`` timing span."""
+
+    def execute(self, raise_on_error: bool = True):
+        with span('redis'):
+            return _guarded(super().execute, raise_on_error)
+
+
+class TimedRedis(Redis):
+    """Redis client that records each command as a ``redis`` timing span.
+
+    Every command also passes through the Redis circuit breaker: while it is
+    open, commands raise ``ConnectionError`` at once, which callers already
+    treat as a cache miss and answer from Postgres.
+    """
+
+    def execute_command(self, *args, **options):
+        with span('redis'):
+            return _guarded(super().execute_command, *args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None) -> Pipeline:
+        return TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+def _guarded(call, *args, **kwargs):
+    if not redis_breaker.allow():
+        raise exceptions.ConnectionError('Redis circuit breaker is open')
+    try:
+        result = call(*args, **kwargs)
+    except (exceptions.ConnectionError, exceptions.TimeoutError):
+        redis_breaker.record_failure()
+        raise
+    except Exception:
+        # Redis answered (e.g. a ResponseError); it is up.
+        redis_breaker.record_success()
+        raise
+    redis_breaker.record_success()
+    return result
+
+
+# These will hold the singleton client instances
 _redis_client: Redis | None = None
+_redis_bytes_client: Redis | None = None
+
+
+def _connect(decode_responses: bool) -> Redis:
+    logger.info("Initializing Redis client...")
+    client = TimedRedis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        decode_responses=decode_responses,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    )
+    try:
+        client.ping()
+        logger.info(
+            '✅ Redis Connected successfully to %s:%s',
+            settings.REDIS_HOST, settings.REDIS_PORT
+        )
+    except exceptions.RedisError as e:
+        # Connections are opened per command, so the client recovers by itself
+        # once Redis is back; until then callers fall back to Postgres.
+        logger.error('❌ Redis Connection Error: %s', e, exc_info=True)
+    return client
 
 
 def get_redis_client() -> Redis:
@@ -23,25 +89,30 @@ def get_redis_client() -> Redis:
 
     # If the client isn't initialized, create it
     if _redis_client is None:
-        logger.info("Initializing Redis client...")
-        try:
-            client = Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                decode_responses=True,
-                socket_connect_timeout=5
-            )
-            client.ping()
-            _redis_client = client  # Set the global instance
-            logger.info(
-                '✅ Redis Connected successfully to %s:%s',
-                settings.REDIS_HOST, settings.REDIS_PORT
-            )
-
-        except exceptions.ConnectionError as e:
-            logger.error('❌ Redis Connection Error: %s', e, exc_info=True)
-            # This will raise a 500 error on the request that
-            # first tries to use Redis, but it won't crash the app on startup.
-            raise InternalServerError('Could not connect to Redis service') from e
+        _redis_client = _connect(decode_responses=True)
 
     return _redis_client
+
+
+def get_redis_bytes_client() -> Redis:
+    """
+    Dependency function to get a singleton Redis client that returns raw bytes.
+
+    Used for binary values such as pre-compressed response bodies, which the
+    decoding client would try to read as UTF-8.
+    """
+    global _redis_bytes_client
+
+    if _redis_bytes_client is None:
+        _redis_bytes_client = _connect(decode_responses=False)
+
+    return _redis_bytes_client
+
+
+def close_redis_client() -> None:
+    global _redis_client, _redis_bytes_client
+
+    for client in (_redis_client, _redis_bytes_client):
+        if client is not None:
+            client.close()
+    _redis_client = _redis_bytes_client = None
@@ -1,14 +1,30 @@
 import base64
 import hashlib
 import hmac
+from functools import lru_cache
 
+# Secret hashes only depend on the username for a given app client, and the
+# same users log in, refresh and verify repeatedly.
+SECRET_HASH_CACHE_SIZE = 4096
 
+
+@lru_cache(maxsize=SECRET_HASH_CACHE_SIZE)
 def get_secret_hash(username: str, client_id: str, client_secret: str) -> str:
-    message = username + client_id
-    digest = hmac.new(
-        client_secret.encode(),
-        msg=message.encode(),
-        digestmod=hashlib.sha256
-    ).digest()
-
-    return base64.b64encode(digest).decode()
+    return base64.b64encode(hmac_sha256(client_secret, (username + client_id).encode())).decode()
+
+
+def hmac_sha256(key: str, message: bytes) -> bytes:
+    mac = _keyed_hmac(key).copy()
+    mac.update(message)
+    return mac.digest()
+
+
+@lru_cache(maxsize=None)
+def _keyed_hmac(client_secret: str) -> hmac.HMAC:
+    """HMAC-SHA256 with the key schedule already applied; callers ``copy()`` it instead of re-keying."""
+    return hmac.new(client_secret.encode(), digestmod=hashlib.sha256)
+
+
+def prime_secret_hash(client_secret: str) -> None:
+    """Key the HMAC up front so the first login doesn't pay for it."""
+    _keyed_hmac(client_secret)
@@ -0,0 +1,49 @@
+"""Production server profile: gunicorn supervising uvicorn workers (see ``gunicorn.conf.py``).
+
+Each worker runs the app on uvloop with the httptools parser. On SIGTERM a
+worker stops accepting connections, gives in-flight requests up to
+``SERVER_GRACEFUL_TIMEOUT_SECONDS`` to finish, then runs the lifespan
+shutdown, which drains background jobs, flushes buffered views and closes the
+database, Redis and AWS pools.
+"""
+import math
+import os
+
+from uvicorn_worker import UvicornWorker
+
+from app.core.config import settings
+
+# Lifespan shutdown after the in-flight drain: background jobs, the last view flush, closing pools.
+SHUTDOWN_GRACE_SECONDS = 5
+
+
+def worker_count() -> int:
+    """``SERVER_WORKERS``, or one worker per CPU this process may run on (cgroup/affinity aware)."""
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def shutdown_timeout() -> int:
+    """How long the gunicorn master waits for a stopping worker before killing it."""
+    return math.ceil(
+        settings.SERVER_GRACEFUL_TIMEOUT_SECONDS + settings.BACKGROUND_DRAIN_SECONDS + SHUTDOWN_GRACE_SECONDS
+    )
+
+
+class AppWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop and httptools instead of uvicorn's ``auto`` fallbacks.
+
+    Keep-alive, backlog and forwarded IPs come from the gunicorn config; the
+    rest is passed straight to ``uvicorn.Config``.
+    """
+
+    CONFIG_KWARGS = {
+        'loop': 'uvloop',
+        'http': 'httptools',
+        'limit_concurrency': settings.SERVER_LIMIT_CONCURRENCY or None,
+        'timeout_graceful_shutdown': settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    }
@@ -0,0 +1,120 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator
+
+from botocore.client import BaseClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+_SERVICE_SPAN_NAMES = {
+    'cognito-idp': 'cognito',
+    's3': 's3',
+}
+
+
+class RequestTimings:
+    """Accumulated span durations for a single sampled request."""
+
+    __slots__ = ('_durations', '_counts')
+
+    def __init__(self):
+        self._durations: dict[str, float] = {}
+        self._counts: dict[str, int] = {}
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self._durations[name] = self._durations.get(name, 0.0) + duration_ms
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def server_timing_header(self, total_ms: float) -> str:
+        entries = [
+            f'{name};dur={duration:.1f};desc="{self._counts[name]}x"'
+            for name, duration in self._durations.items()
+        ]
+        entries.append(f'total;dur={total_ms:.1f}')
+        return ', '.join(entries)
+
+    def as_log_fields(self) -> dict[str, float | int]:
+        fields: dict[str, float | int] = {}
+        for name, duration in self._durations.items():
+            fields[f'{name}_ms'] = round(duration, 1)
+            fields[f'{name}_count'] = self._counts[name]
+        return fields
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar('request_timings', default=None)
+
+
+def start_request_timings() -> tuple[RequestTimings | None, Token]:
+    """Begin span collection for the current request if it is sampled.
+
+    Unsampled requests bind ``None`` so every span helper short-circuits on a
+    single contextvar lookup.
+    """
+    rate = settings.TIMING_SAMPLE_RATE
+    timings = RequestTimings() if rate > 0 and (rate >= 1 or random.random() < rate) else None
+    return timings, _current_timings.set(timings)
+
+
+def stop_request_timings(token: Token) -> None:
+    _current_timings.reset(token)
+
+
+def record_span(name: str, duration_ms: float) -> None:
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.record(name, duration_ms)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(name, (time.perf_counter() - start) * 1000)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record every cursor execution on ``engine`` as a ``db`` span."""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_span_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info['_span_start'].pop()
+        record_span('db', (time.perf_counter() - start) * 1000)
+
+    @event.listens_for(engine, 'handle_error')
+    def _on_error(exception_context):
+        starts = exception_context.connection.info.get('_span_start') if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+
+def instrument_boto_client(client: BaseClient) -> BaseClient:
+    """Record every API call made by ``client`` as a span named after its service."""
+    name = _SERVICE_SPAN_NAMES.get(client.meta.service_model.endpoint_prefix, 'aws')
+
+    def _before_call(context, **_):
+        context['_span_start'] = time.perf_counter()
+
+    def _after_call(context, **_):
+        start = context.pop('_span_start', None)
+        if start is not None:
+            record_span(name, (time.perf_counter() - start) * 1000)
+
+    client.meta.events.register('before-call', _before_call)
+    client.meta.events.register('after-call', _after_call)
+    client.meta.events.register('after-call-error', _after_call)
+    return client
@@ -2,18 +2,30 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.auth import router as auth_router
-from app.core.database import init_db
 from app.core.error_handlers import register_exception_handlers
+from app.core.health import router as health_router
+from app.core.lifespan import lifespan
 from app.core.logging_config import setup_logging
-from app.core.middleware import AccessLogMiddleware
+from app.core.metrics import router as metrics_router
+from app.core.middleware import (
+    AccessLogMiddleware,
+    CompressionMiddleware,
+    MetricsMiddleware,
+    RateLimitMiddleware,
+    ReadYourWritesMiddleware,
+)
 from app.video import router as video_router
 
 
 def create_app():
     setup_logging()
-    api = FastAPI()
+    api = FastAPI(lifespan=lifespan)
 
+    api.add_middleware(ReadYourWritesMiddleware)
+    api.add_middleware(CompressionMiddleware)
+    api.add_middleware(RateLimitMiddleware)
     api.add_middleware(AccessLogMiddleware)
+    api.add_middleware(MetricsMiddleware)
 
     api.add_middleware(
         CORSMiddleware,
@@ -26,8 +38,8 @@ def create_app():
 
     register_exception_handlers(api)
 
-    init_db()
-
+    api.include_router(router=health_router)
+    api.include_router(router=metrics_router)
     api.include_router(router=auth_router, prefix="/api/v1")
     api.include_router(router=video_router, prefix='/api/v1/upload')
 
@@ -0,0 +1,215 @@
+"""Cleanup of abandoned uploads: stale video rows, and raw objects nobody registered.
+
+Two passes, each in batches with a pause in between so the job never
+competes with foreground traffic for Postgres or S3:
+
+- Videos stuck FAILED or IN_PROGRESS past their cutoff are claimed first: one
+  guarded ``UPDATE ... RETURNING`` soft-deletes a batch by setting
+  ``deleted_at`` and marks it ``purge_pending``, so a video that completes
+  meanwhile is never touched and a claimed one is never served again. Then
+  their raw upload, thumbnail and any transcoder output are removed with
+  ``DeleteObjects`` (up to 1000 keys per call), and ``purge_pending`` is
+  cleared for each video whose objects are all gone. Claimed videos still
+  pending, after a failed delete or a crash, are retried first on later runs.
+- The raw bucket is listed in key order from a cursor kept in Redis, a page
+  per batch, and objects older than ``CLEANUP_ORPHAN_AFTER_SECONDS`` with no
+  live row (an upload URL was used but no metadata was ever posted) are
+  deleted. The cursor wraps around once the listing reaches the end.
+
+A Redis lock keeps two workers from cleaning at once, and a marker that
+expires after ``CLEANUP_INTERVAL_SECONDS`` makes the fleet run the job once
+per interval rather than once per worker. The marker is only set after a pass
+succeeds, so a failed pass is retried on the next tick.
+
+    python -m app.video.cleanup   # one pass now, regardless of the schedule
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from botocore.exceptions import BotoCoreError
+from redis import Redis, exceptions
+from redis.lock import Lock
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.cognito import get_s3_client
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exceptions import AppError
+from app.core.logging_config import setup_logging
+from app.core.metrics import CLEANUP_DELETED
+from app.core.redis import get_redis_client
+from app.video.media import playback_prefix, thumbnail_key
+from app.video.repository import DELETE_OBJECTS_LIMIT, VideoRepository
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = 'cleanup:lock'
+LAST_RUN_KEY = 'cleanup:last_run'
+ORPHAN_CURSOR_KEY = 'cleanup:orphans:cursor'
+# Renewed after every batch, so it only has to outlast one batch and its pause.
+LOCK_TIMEOUT_SECONDS = 300
+
+
+@dataclass(frozen=True, slots=True)
+class CleanupResult:
+    videos: int = 0
+    orphans: int = 0
+    s3_keys: int = 0
+
+
+async def run_cleanup(redis_client: Redis, video_repo: VideoRepository, force: bool = False) -> CleanupResult | None:
+    """One cleanup pass, or None when another worker holds the lock or the fleet already ran this interval."""
+    lock = redis_client.lock(LOCK_KEY, timeout=LOCK_TIMEOUT_SECONDS)
+    if not lock.acquire(blocking=False):
+        return None
+
+    try:
+        if not force and redis_client.exists(LAST_RUN_KEY):
+            return None
+
+        videos, video_keys = await purge_stale_videos(video_repo, lock)
+        orphans, orphan_keys = await purge_orphaned_uploads(redis_client, video_repo, lock)
+        redis_client.set(LAST_RUN_KEY, int(time.time()), ex=max(1, settings.CLEANUP_INTERVAL_SECONDS))
+        return CleanupResult(videos=videos, orphans=orphans, s3_keys=video_keys + orphan_keys)
+    finally:
+        try:
+            lock.release()
+        except exceptions.LockError:
+            logger.warning("Upload cleanup outlived its lock")
+
+
+async def purge_stale_videos(video_repo: VideoRepository, lock: Lock) -> tuple[int, int]:
+    """Claim stale videos and delete their objects; returns ``(videos, s3 keys)`` purged.
+
+    Videos claimed earlier and still pending are taken before new claims.
+    """
+    now = datetime.now(timezone.utc)
+    failed_before = now - timedelta(seconds=settings.CLEANUP_FAILED_AFTER_SECONDS)
+    in_progress_before = now - timedelta(seconds=settings.CLEANUP_IN_PROGRESS_AFTER_SECONDS)
+
+    videos = keys = 0
+    after = None
+    for batch in range(settings.CLEANUP_MAX_BATCHES):
+        if batch:
+            await _pause(lock)
+        rows = await video_repo.get_pending_purges(after, settings.CLEANUP_BATCH_SIZE)
+        if rows:
+            # Each pending video is retried at most once per pass.
+            after = (rows[-1].deleted_at, rows[-1].id)
+        else:
+            rows = await video_repo.claim_stale_videos(failed_before, in_progress_before, settings.CLEANUP_BATCH_SIZE)
+        if not rows:
+            break
+
+        objects = {row.id: await _stored_objects(video_repo, row.video_s3_key) for row in rows}
+        failed = await _delete(video_repo, [item for items in objects.values() for item in items])
+        purged = [video_id for video_id, items in objects.items() if not failed.intersection(items)]
+        if purged:
+            await video_repo.mark_purged(purged)
+        videos += len(purged)
+        keys += sum(len(objects[video_id]) for video_id in purged)
+
+    CLEANUP_DELETED.labels(kind='videos').inc(videos)
+    if videos:
+        logger.info("Purged %d stale videos and %d S3 keys", videos, keys)
+    return videos, keys
+
+
+async def purge_orphaned_uploads(redis_client: Redis, video_repo: VideoRepository, lock: Lock) -> tuple[int, int]:
+    """Delete old raw uploads with no live video row; returns ``(uploads, s3 keys)`` removed."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.CLEANUP_ORPHAN_AFTER_SECONDS)
+    cursor = redis_client.get(ORPHAN_CURSOR_KEY) or ''
+
+    orphans = keys = 0
+    for batch in range(settings.CLEANUP_MAX_BATCHES):
+        if batch:
+            await _pause(lock)
+        page, more = await video_repo.list_objects(
+            settings.S3_RAW_VIDEOS_BUCKET, start_after=cursor, limit=DELETE_OBJECTS_LIMIT
+        )
+        candidates = [key for key, last_modified in page if last_modified < cutoff]
+        registered = await video_repo.get_video_owners_by_s3_keys(candidates)
+        unregistered = [key for key in candidates if key not in registered]
+
+        objects = {key: await _stored_objects(video_repo, key) for key in unregistered}
+        failed = await _delete(video_repo, [item for items in objects.values() for item in items])
+        for items in objects.values():
+            if not failed.intersection(items):
+                orphans += 1
+                keys += len(items)
+
+        # Resume after this page next time; start over once the listing is exhausted.
+        cursor = page[-1][0] if more and page else ''
+        redis_client.set(ORPHAN_CURSOR_KEY, cursor)
+        if not cursor:
+            break
+
+    CLEANUP_DELETED.labels(kind='orphans').inc(orphans)
+    if orphans:
+        logger.info("Deleted %d orphaned uploads (%d S3 keys)", orphans, keys)
+    return orphans, keys
+
+
+async def _stored_objects(video_repo: VideoRepository, video_s3_key: str) -> list[tuple[str, str]]:
+    """``(bucket, key)`` of everything stored for a video: raw upload, thumbnail and transcoder output."""
+    objects = [
+        (settings.S3_RAW_VIDEOS_BUCKET, video_s3_key),
+        (settings.S3_VIDEO_THUMBNAILS_BUCKET, thumbnail_key(video_s3_key)),
+    ]
+    prefix, start_after, more = playback_prefix(video_s3_key), '', True
+    while more:
+        page, more = await video_repo.list_objects(
+            settings.S3_PROCESSED_VIDEOS_BUCKET, prefix=prefix, start_after=start_after
+        )
+        objects.extend((settings.S3_PROCESSED_VIDEOS_BUCKET, key) for key, _ in page)
+        start_after = page[-1][0] if page else ''
+        more = more and bool(page)
+    return objects
+
+
+async def _delete(video_repo: VideoRepository, objects: list[tuple[str, str]]) -> set[tuple[str, str]]:
+    """Delete ``(bucket, key)`` pairs, batched per bucket; returns the pairs that could not be deleted."""
+    by_bucket: dict[str, list[str]] = {}
+    for bucket, key in objects:
+        by_bucket.setdefault(bucket, []).append(key)
+
+    failed = set()
+    for bucket, keys in by_bucket.items():
+        failed.update((bucket, key) for key in await video_repo.delete_objects(bucket, keys))
+    CLEANUP_DELETED.labels(kind='s3_keys').inc(len(objects) - len(failed))
+    return failed
+
+
+async def _pause(lock: Lock) -> None:
+    await asyncio.sleep(settings.CLEANUP_BATCH_PAUSE_SECONDS)
+    lock.reacquire()
+
+
+async def _cleanup_once(force: bool = False) -> None:
+    database = SessionLocal()
+    try:
+        result = await run_cleanup(get_redis_client(), VideoRepository(get_s3_client(), database), force=force)
+        if result is not None:
+            logger.info(
+                "Upload cleanup finished",
+                extra={'videos': result.videos, 'orphans': result.orphans, 's3_keys': result.s3_keys},
+            )
+    except (AppError, BotoCoreError, SQLAlchemyError, exceptions.RedisError) as e:
+        logger.error(f"Upload cleanup failed: {e}")
+    finally:
+        database.close()
+
+
+async def run_cleanup_scheduler(interval: float) -> None:
+    """Offer to run the cleanup a few times per ``interval`` until cancelled; the marker keeps it to one run."""
+    while True:
+        await asyncio.sleep(interval / 4)
+        await _cleanup_once()
+
+
+if __name__ == '__main__':
+    setup_logging(use_queue=False)
+    asyncio.run(_cleanup_once(force=True))
@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.core.cognito import get_s3_client
 from app.core.database import get_db
-from app.core.redis import get_redis_client
+from app.core.redis import get_redis_bytes_client, get_redis_client
 from app.video import VideoRepository
 
 
@@ -15,8 +15,9 @@ async def get_video_repo(s3: BaseClient = Depends(get_s3_client), database: Sess
 
 async def get_video_service(
         repo: VideoRepository = Depends(get_video_repo),
-        redis_client: Redis = Depends(get_redis_client)
+        redis_client: Redis = Depends(get_redis_client),
+        redis_bytes_client: Redis = Depends(get_redis_bytes_client),
 ):
     from app.video import VideoService
 
-    return VideoService(video_repo=repo, redis_client=redis_client)
+    return VideoService(video_repo=repo, redis_client=redis_client, redis_bytes_client=redis_bytes_client)
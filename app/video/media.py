@@ -0,0 +1,95 @@
+"""Where a video's thumbnail and playback manifest live, and their public URLs.
+
+The transcoder writes the HLS master playlist of ``videos/{sub}/{uuid}.mp4``
+to ``videos/{sub}/{uuid}/master.m3u8`` in the processed bucket; the client
+uploads the thumbnail to the key ``generate_presigned_thumbnail_url`` hands out.
+Media playlists next to it reference their segments by relative URI.
+"""
+import posixpath
+import re
+from urllib.parse import quote, unquote, urlsplit
+
+from app.core.config import settings
+
+PLAYBACK_MANIFEST_NAME = 'master.m3u8'
+
+# URI attribute of tags such as #EXT-X-MAP (init section) and #EXT-X-KEY
+_URI_ATTRIBUTE = re.compile(r'URI="([^"]*)"')
+
+
+def thumbnail_key(video_s3_key: str) -> str:
+    return video_s3_key.replace('videos/', 'thumbnails/').replace('.mp4', '.jpg')
+
+
+def playback_manifest_key(video_s3_key: str) -> str:
+    return f'{playback_prefix(video_s3_key)}{PLAYBACK_MANIFEST_NAME}'
+
+
+def playback_prefix(video_s3_key: str) -> str:
+    """Key prefix holding every playlist and segment of the video in the processed bucket."""
+    return f'{video_s3_key.removesuffix(".mp4")}/'
+
+
+def master_playlist(variants: list[tuple[str, int, str, str]]) -> str:
+    """HLS master playlist for ``(resolution, bitrate, codec, url)`` variants."""
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3']
+    for resolution, bitrate, codec, url in variants:
+        lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bitrate},RESOLUTION={resolution},CODECS="{codec}"')
+        lines.append(url)
+    return '\n'.join(lines) + '\n'
+
+
+def media_playlist_uri(index: int) -> str:
+    """Where the API serves the ``index``-th rendition's media playlist, relative to the master playlist."""
+    return f'renditions/{index}.m3u8'
+
+
+def media_playlist_keys(playlist: str, playlist_key: str) -> list[str]:
+    """Keys of the segments, init sections and keys a media playlist references relative to itself.
+
+    Absolute URIs are left out; they are not objects next to the playlist.
+    """
+    keys = []
+    for line in playlist.splitlines():
+        line = line.strip()
+        uris = _URI_ATTRIBUTE.findall(line) if line.startswith('#') else [line] if line else []
+        keys.extend(key for key in (_relative_key(uri, playlist_key) for uri in uris) if key is not None)
+    return list(dict.fromkeys(keys))
+
+
+def rewrite_media_playlist(playlist: str, playlist_key: str, urls: dict[str, str]) -> str:
+    """The media playlist with each relative URI whose key is in ``urls`` replaced by that URL."""
+    def replace(uri: str) -> str:
+        key = _relative_key(uri, playlist_key)
+        return urls.get(key, uri) if key is not None else uri
+
+    lines = []
+    for line in playlist.splitlines():
+        line = line.strip()
+        if line.startswith('#'):
+            line = _URI_ATTRIBUTE.sub(lambda match: f'URI="{replace(match.group(1))}"', line)
+        elif line:
+            line = replace(line)
+        lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+
+def _relative_key(uri: str, playlist_key: str) -> str | None:
+    parts = urlsplit(uri)
+    if parts.scheme or parts.netloc or parts.path.startswith('/'):
+        return None
+    return posixpath.normpath(posixpath.join(posixpath.dirname(playlist_key), unquote(parts.path)))
+
+
+def public_url(bucket: str, key: str) -> str:
+    """URL of an object through the bucket's CDN if one is configured, otherwise straight from S3."""
+    base_url = _CDN_BASE_URLS.get(bucket)
+    if not base_url:
+        base_url = f'https://{bucket}.s3.{settings.REGION_NAME}.amazonaws.com'
+    return f'{base_url.rstrip("/")}/{quote(key)}'
+
+
+_CDN_BASE_URLS = {
+    settings.S3_VIDEO_THUMBNAILS_BUCKET: settings.THUMBNAILS_CDN_BASE_URL,
+    settings.S3_PROCESSED_VIDEOS_BUCKET: settings.PROCESSED_VIDEOS_CDN_BASE_URL,
+}
@@ -1,7 +1,8 @@
 import enum
 import uuid
+from datetime import datetime
 
-from sqlalchemy import ForeignKey, Enum
+from sqlalchemy import BigInteger, ForeignKey, Enum, DateTime, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import Uuid
 
@@ -27,7 +28,7 @@ class Video(Base):
     title: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[str] = mapped_column(nullable=True)
     user_id: Mapped[str] = mapped_column(ForeignKey('users.cognito_sub'), nullable=False)
-    video_s3_key: Mapped[str] = mapped_column(nullable=False)
+    video_s3_key: Mapped[str] = mapped_column(nullable=False, unique=True, index=True)
     visibility: Mapped[VisibilityStatus] = mapped_column(
         Enum(VisibilityStatus),
         default=VisibilityStatus.PRIVATE,
@@ -38,3 +39,41 @@ class Video(Base):
         default=ProcessingStatus.IN_PROGRESS,
         nullable=False,
     )
+    # Lags Redis by up to VIEW_FLUSH_INTERVAL_SECONDS; see app/video/views.py.
+    views: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default='0')
+    # Recorded from a HEAD of the uploaded object when the metadata is accepted.
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    s3_etag: Mapped[str] = mapped_column(nullable=True)
+    # Orders the feed: new uploads land at its end instead of on random pages.
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Bumped by SQLAlchemy on every UPDATE; drives the ETag of the video.
+    version: Mapped[int] = mapped_column(nullable=False, default=1, server_default='1')
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+    # Set by the cleanup job (app/video/cleanup.py) when it claims the video; such rows are never served.
+    deleted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Claimed by the cleanup job but some of its objects are not deleted yet; retried on the next run.
+    purge_pending: Mapped[bool] = mapped_column(nullable=False, default=False, server_default='false')
+
+    __mapper_args__ = {'version_id_col': version}
+
+
+class Rendition(Base):
+    """One HLS/DASH variant the transcoder produced for a video, stored in the processed bucket."""
+
+    __tablename__ = 'video_renditions'
+    __table_args__ = (UniqueConstraint('video_id', 'manifest_key', name='uq_video_renditions_video_manifest'),)
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    video_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey('videos.id', ondelete='CASCADE'), nullable=False, index=True
+    )
+    resolution: Mapped[str] = mapped_column(nullable=False)  # e.g. "1920x1080"
+    bitrate: Mapped[int] = mapped_column(nullable=False)  # Peak bits per second
+    codec: Mapped[str] = mapped_column(nullable=False)  # RFC 6381 string, e.g. "avc1.640028,mp4a.40.2"
+    manifest_key: Mapped[str] = mapped_column(nullable=False)  # Media playlist key in the processed bucket
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
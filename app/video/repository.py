@@ -1,18 +1,35 @@
 import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Sequence, Optional
 
 from botocore.client import BaseClient
 from botocore.exceptions import ClientError
-from sqlalchemy import select
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import BigInteger, Row, Uuid, and_, any_, column, func, or_, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 from app.core.exceptions import InternalServerError, NotFoundError
-from app.video.models import Video, VisibilityStatus, ProcessingStatus
+from app.core.timing import span
+from app.video.models import Rendition, Video, VisibilityStatus, ProcessingStatus
 
 logger = logging.getLogger(__name__)
 
+_MISSING_OBJECT_CODES = frozenset({'404', 'NoSuchKey', 'NotFound'})
+# DeleteObjects accepts at most this many keys per request.
+DELETE_OBJECTS_LIMIT = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class S3ObjectInfo:
+    size: int
+    etag: str
+
 
 class VideoRepository:
     def __init__(self, s3: BaseClient, database: Session):
@@ -21,36 +38,117 @@ class VideoRepository:
 
     async def generate_presigned_video_url(self, video_id: str) -> str:
         try:
-            presigned_url = self.s3.generate_presigned_url(
-                'put_object',
-                Params={
-                    'Bucket': settings.S3_RAW_VIDEOS_BUCKET,
-                    'Key': video_id,
-                    # 'ACL': 'private',
-                    'ContentType': 'video/mp4',
-                },
-                # ExpiresIn=3600 # URL valid for 1 hour
-            )
+            with span('s3_presign'):
+                presigned_url = self.s3.generate_presigned_url(
+                    'put_object',
+                    Params={
+                        'Bucket': settings.S3_RAW_VIDEOS_BUCKET,
+                        'Key': video_id,
+                        # 'ACL': 'private',
+                        'ContentType': 'video/mp4',
+                    },
+                    # ExpiresIn=3600 # URL valid for 1 hour
+                )
             return presigned_url
         except ClientError as e:
             raise _generate_s3_error(e, operation='generate_presigned_url')
 
     async def generate_presigned_thumbnail_url(self, thumbnail_id: str) -> str:
         try:
-            presigned_url = self.s3.generate_presigned_url(
-                'put_object',
-                Params={
-                    'Bucket': settings.S3_VIDEO_THUMBNAILS_BUCKET,
-                    'Key': thumbnail_id,
-                    'ACL': 'public-read',
-                    'ContentType': 'image/jpg',
-                },
-                # ExpiresIn=3600 # URL valid for 1 hour
-            )
+            with span('s3_presign'):
+                presigned_url = self.s3.generate_presigned_url(
+                    'put_object',
+                    Params={
+                        'Bucket': settings.S3_VIDEO_THUMBNAILS_BUCKET,
+                        'Key': thumbnail_id,
+                        'ACL': 'public-read',
+                        'ContentType': 'image/jpg',
+                    },
+                    # ExpiresIn=3600 # URL valid for 1 hour
+                )
             return presigned_url
         except ClientError as e:
             raise _generate_s3_error(e, operation='generate_presigned_url')
 
+    async def generate_presigned_get_urls(self, objects: list[tuple[str, str]], expires_in: int) -> list[str]:
+        """Presigned GET URLs for ``(bucket, key)`` pairs, signed in one pass.
+
+        Signing is local (no request to S3), so a page of URLs costs CPU only.
+        """
+        try:
+            with span('s3_presign'):
+                return [
+                    self.s3.generate_presigned_url(
+                        'get_object', Params={'Bucket': bucket, 'Key': key}, ExpiresIn=expires_in
+                    )
+                    for bucket, key in objects
+                ]
+        except ClientError as e:
+            raise _generate_s3_error(e, operation='generate_presigned_url')
+
+    async def head_video_object(self, video_s3_key: str) -> Optional[S3ObjectInfo]:
+        """Size and ETag of an uploaded raw video, or None if nothing was uploaded under the key.
+
+        boto3 blocks, so the HEAD runs on the threadpool instead of stalling the event loop.
+        """
+        try:
+            response = await run_in_threadpool(
+                self.s3.head_object, Bucket=settings.S3_RAW_VIDEOS_BUCKET, Key=video_s3_key
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in _MISSING_OBJECT_CODES:
+                return None
+            raise _generate_s3_error(e, operation='head_object')
+        return S3ObjectInfo(size=response['ContentLength'], etag=response['ETag'].strip('"'))
+
+    async def get_object_text(self, bucket: str, key: str) -> Optional[str]:
+        """Body of a small text object such as a playlist, or None if there is no such object."""
+        try:
+            response = await run_in_threadpool(self.s3.get_object, Bucket=bucket, Key=key)
+            body = await run_in_threadpool(response['Body'].read)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in _MISSING_OBJECT_CODES:
+                return None
+            raise _generate_s3_error(e, operation='get_object')
+        return body.decode()
+
+    async def list_objects(
+            self, bucket: str, prefix: str = '', start_after: str = '', limit: int = 1000
+    ) -> tuple[list[tuple[str, datetime]], bool]:
+        """One page of ``(key, last_modified)`` in key order after ``start_after``, and whether more follow."""
+        try:
+            response = await run_in_threadpool(
+                self.s3.list_objects_v2, Bucket=bucket, Prefix=prefix, StartAfter=start_after, MaxKeys=limit
+            )
+        except ClientError as e:
+            raise _generate_s3_error(e, operation='list_objects_v2')
+        objects = [(item['Key'], item['LastModified']) for item in response.get('Contents', [])]
+        return objects, response.get('IsTruncated', False)
+
+    async def delete_objects(self, bucket: str, keys: list[str]) -> set[str]:
+        """Delete ``keys`` with one ``DeleteObjects`` call per 1000; returns the keys S3 could not delete.
+
+        Keys that do not exist count as deleted, so retrying a partly failed batch is safe.
+        """
+        failed = set()
+        for start in range(0, len(keys), DELETE_OBJECTS_LIMIT):
+            chunk = keys[start:start + DELETE_OBJECTS_LIMIT]
+            try:
+                response = await run_in_threadpool(
+                    self.s3.delete_objects,
+                    Bucket=bucket,
+                    Delete={'Objects': [{'Key': key} for key in chunk], 'Quiet': True},
+                )
+            except ClientError as e:
+                raise _generate_s3_error(e, operation='delete_objects')
+            for error in response.get('Errors', []):
+                logger.warning(
+                    "S3 could not delete %s/%s: %s", bucket, error.get('Key'), error.get('Code'),
+                    extra={"s3_error_code": error.get('Code'), "s3_error_message": error.get('Message')},
+                )
+                failed.add(error['Key'])
+        return failed
+
     async def save_video_metadata(
             self,
             user_id: str,
@@ -58,49 +156,250 @@ class VideoRepository:
             description: str,
             video_s3_key: str,
             visibility: str,
-    ) -> Video:
+            size_bytes: int | None = None,
+            s3_etag: str | None = None,
+    ) -> Optional[Video]:
+        """Insert the video, or return the row ``user_id`` already registered under ``video_s3_key``.
+
+        A single ``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` both checks
+        and writes, so concurrent retries cannot race each other into duplicates.
+        The no-op update only matches the caller's own row; None means another
+        user owns the key.
+        """
+        statement = insert(Video).values(
+            id=uuid.uuid4(),
+            title=title,
+            description=description,
+            user_id=user_id,
+            video_s3_key=video_s3_key,
+            visibility=VisibilityStatus[visibility],
+            processing_status=ProcessingStatus.IN_PROGRESS,
+            size_bytes=size_bytes,
+            s3_etag=s3_etag,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[Video.video_s3_key],
+            # Rewriting the key to itself locks the existing row so RETURNING can
+            # hand it back; the original title, visibility and version are kept.
+            set_={'video_s3_key': statement.excluded.video_s3_key},
+            where=(Video.user_id == statement.excluded.user_id) & Video.deleted_at.is_(None),
+        ).returning(Video)
+
         try:
-            video = Video(
-                title=title,
-                description=description,
-                user_id=user_id,
-                video_s3_key=video_s3_key,
-                visibility=VisibilityStatus[visibility],
-            )
-            self.db.add(video)
+            video = self.db.execute(
+                select(Video).from_statement(statement),
+                execution_options={'populate_existing': True},
+            ).scalar_one_or_none()
+            if video is not None:
+                # Detached objects are not expired on commit, so RETURNING's values
+                # are served without the reload ``refresh()`` used to cost.
+                self.db.expunge(video)
             self.db.commit()
-            self.db.refresh(video)
             return video
         except SQLAlchemyError as e:
             self.db.rollback()
             raise _generate_database_error(e, operation='save_video_metadata')
 
-    async def get_all_videos(self) -> Sequence[Video]:
+    async def bulk_save_video_metadata(self, user_id: str, items: list[dict]) -> dict[str, uuid.UUID]:
+        """Insert many videos in one multi-row ``INSERT ... ON CONFLICT DO NOTHING RETURNING``.
+
+        ``items`` hold ``title``, ``description``, ``video_s3_key``,
+        ``visibility`` (a ``VisibilityStatus`` name), ``size_bytes`` and
+        ``s3_etag``. Returns the ids of the rows
+        actually inserted, keyed by S3 key; keys that already existed are absent.
+        """
+        rows = [
+            {
+                'id': uuid.uuid4(),
+                'title': item['title'],
+                'description': item['description'],
+                'user_id': user_id,
+                'video_s3_key': item['video_s3_key'],
+                'visibility': VisibilityStatus[item['visibility']],
+                'processing_status': ProcessingStatus.IN_PROGRESS,
+                'size_bytes': item['size_bytes'],
+                's3_etag': item['s3_etag'],
+            }
+            for item in items
+        ]
+        statement = (
+            insert(Video)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Video.video_s3_key])
+            .returning(Video.video_s3_key, Video.id)
+        )
+
+        try:
+            inserted = {s3_key: video_id for s3_key, video_id in self.db.execute(statement)}
+            self.db.commit()
+            return inserted
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise _generate_database_error(e, operation='bulk_save_video_metadata')
+
+    async def get_video_owners_by_s3_keys(self, s3_keys: list[str]) -> dict[str, tuple[uuid.UUID, str]]:
+        """``(id, user_id)`` of existing videos, keyed by S3 key."""
+        if not s3_keys:
+            return {}
+        statement = (
+            select(Video.video_s3_key, Video.id, Video.user_id)
+            .where(Video.video_s3_key.in_(s3_keys))
+            .where(Video.deleted_at.is_(None))
+        )
+        return {s3_key: (video_id, user_id) for s3_key, video_id, user_id in self.db.execute(statement)}
+
+    async def get_all_videos(self, limit: int | None = None, offset: int = 0) -> Sequence[Video]:
         statement = (
             select(Video)
             .where(Video.processing_status == ProcessingStatus.COMPLETED)
             .where(Video.visibility == VisibilityStatus.PUBLIC)
-
+            .where(Video.deleted_at.is_(None))
+            .order_by(Video.created_at, Video.id)
+            .offset(offset)
+            .limit(limit)
+            .execution_options(read_replica=True)
         )
 
         videos = self.db.execute(statement).scalars().all()
         return videos
 
+    async def get_videos_by_user(self, user_id: str, limit: int | None = None, offset: int = 0) -> Sequence[Video]:
+        statement = (
+            select(Video)
+            .where(Video.user_id == user_id)
+            .where(Video.deleted_at.is_(None))
+            .order_by(Video.created_at, Video.id)
+            .offset(offset)
+            .limit(limit)
+            .execution_options(read_replica=True)
+        )
+        return self.db.execute(statement).scalars().all()
+
     async def get_video_by_id(self, video_id: str) -> Optional[Video]:
         statement = (
             select(Video)
             .where(Video.id == video_id)
             .where(Video.processing_status == ProcessingStatus.COMPLETED)
+            .where(Video.deleted_at.is_(None))
             .where(Video.visibility.in_([VisibilityStatus.PUBLIC, VisibilityStatus.UNLISTED]))
             .limit(1)
+            .execution_options(read_replica=True)
+        )
+
+        return self.db.execute(statement).scalar_one_or_none()
+
+    async def get_videos_by_ids(self, video_ids: list[str]) -> Sequence[Video]:
+        """Viewable videos (as ``get_video_by_id``) among ``video_ids``, in one ``WHERE id = ANY(...)`` query."""
+        statement = (
+            select(Video)
+            .where(Video.id == any_(array(_parse_uuids(video_ids), type_=Uuid)))
+            .where(Video.processing_status == ProcessingStatus.COMPLETED)
+            .where(Video.deleted_at.is_(None))
+            .where(Video.visibility.in_([VisibilityStatus.PUBLIC, VisibilityStatus.UNLISTED]))
+            .execution_options(read_replica=True)
+        )
+        return self.db.execute(statement).scalars().all()
+
+    async def get_completed_video(self, video_id: str) -> Optional[Video]:
+        """A completed video of any visibility, for callers that have already authorised access (share links)."""
+        statement = (
+            select(Video)
+            .where(Video.id == video_id)
+            .where(Video.processing_status == ProcessingStatus.COMPLETED)
+            .where(Video.deleted_at.is_(None))
+            .limit(1)
+            .execution_options(read_replica=True)
         )
+        return self.db.execute(statement).scalar_one_or_none()
 
+    async def get_video_owner(self, video_id: str) -> Optional[str]:
+        statement = select(Video.user_id).where(Video.id == video_id).where(Video.deleted_at.is_(None))
         return self.db.execute(statement).scalar_one_or_none()
 
+    async def get_playable_video(self, video_id: str, user_id: str) -> Optional[Video]:
+        """A completed video the user may watch: PUBLIC, UNLISTED, or their own."""
+        statement = (
+            select(Video)
+            .where(Video.id == video_id)
+            .where(Video.processing_status == ProcessingStatus.COMPLETED)
+            .where(Video.deleted_at.is_(None))
+            .where(or_(
+                Video.visibility.in_([VisibilityStatus.PUBLIC, VisibilityStatus.UNLISTED]),
+                Video.user_id == user_id,
+            ))
+            .limit(1)
+            .execution_options(read_replica=True)
+        )
+        return self.db.execute(statement).scalar_one_or_none()
+
+    async def get_renditions(self, video_id: str) -> Sequence[Rendition]:
+        statement = (
+            select(Rendition)
+            .where(Rendition.video_id == video_id)
+            .order_by(Rendition.bitrate)
+            .execution_options(read_replica=True)
+        )
+        return self.db.execute(statement).scalars().all()
+
+    async def save_renditions(self, video_id: str, renditions: list[dict]) -> None:
+        """Upsert renditions by ``(video_id, manifest_key)`` in one multi-row statement.
+
+        Re-registering a manifest updates its resolution, bitrate and codec, so
+        the transcoder can safely retry.
+        """
+        statement = insert(Rendition).values([
+            {'id': uuid.uuid4(), 'video_id': video_id, **rendition} for rendition in renditions
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[Rendition.video_id, Rendition.manifest_key],
+            set_={
+                'resolution': statement.excluded.resolution,
+                'bitrate': statement.excluded.bitrate,
+                'codec': statement.excluded.codec,
+            },
+        )
+
+        try:
+            self.db.execute(statement)
+            self.db.commit()
+        except IntegrityError as e:
+            # The only foreign key is the video.
+            self.db.rollback()
+            raise NotFoundError("Video not found") from e
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise _generate_database_error(e, operation='save_renditions')
+
+    async def get_view_counts(self, video_ids: list[str]) -> dict[str, int]:
+        # Read from the primary: seeding Redis from a lagging replica would drop views already flushed.
+        statement = select(Video.id, Video.views).where(Video.id.in_(video_ids))
+        return {str(video_id): views for video_id, views in self.db.execute(statement)}
+
+    async def add_views(self, deltas: dict[str, int]) -> None:
+        """Add view deltas to many videos in one ``UPDATE ... FROM (VALUES ...)``."""
+        rows = values(column('id', Uuid), column('delta', BigInteger), name='deltas').data(
+            [(uuid.UUID(video_id), delta) for video_id, delta in deltas.items()]
+        )
+        statement = (
+            update(Video)
+            .where(Video.id == rows.c.id)
+            # Views are not an edit: leave updated_at alone instead of letting onupdate bump it.
+            .values(views=Video.views + rows.c.delta, updated_at=Video.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            self.db.execute(statement)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise _generate_database_error(e, operation='add_views')
+
     async def get_video_by_s3_key(self, s3_key: str) -> Optional[Video]:
         statement = (
             select(Video)
             .where(Video.video_s3_key == s3_key)
+            .where(Video.deleted_at.is_(None))
             .limit(1)
         )
         return self.db.execute(statement).scalar_one_or_none()
@@ -110,6 +409,7 @@ class VideoRepository:
             statement = (
                 select(Video)
                 .where(Video.id == video_id)
+                .where(Video.deleted_at.is_(None))
                 .limit(1)
             )
             video = self.db.execute(statement).scalar_one_or_none()
@@ -123,6 +423,92 @@ class VideoRepository:
             raise _generate_database_error(e, operation='update_video_processing_status')
 
 
+    async def claim_stale_videos(self, failed_before: datetime, in_progress_before: datetime, limit: int) -> Sequence[Row]:
+        """Soft-delete up to ``limit`` live videos FAILED since ``failed_before`` or IN_PROGRESS since
+        ``in_progress_before``, oldest first, and mark their objects for purging; returns their
+        ``(id, video_s3_key, deleted_at)``.
+
+        One guarded ``UPDATE ... RETURNING``: a video whose status changes concurrently is
+        either claimed before the change or not at all, and ``SKIP LOCKED`` keeps two
+        claimers off the same rows.
+        """
+        stale = (
+            select(Video.id)
+            .where(_stale(failed_before, in_progress_before))
+            .order_by(Video.updated_at, Video.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        statement = (
+            update(Video)
+            .where(Video.id.in_(stale.scalar_subquery()))
+            .where(_stale(failed_before, in_progress_before))
+            .values(deleted_at=func.now(), purge_pending=True)
+            .returning(Video.id, Video.video_s3_key, Video.deleted_at)
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            rows = self.db.execute(statement).all()
+            self.db.commit()
+            return rows
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise _generate_database_error(e, operation='claim_stale_videos')
+
+    async def get_pending_purges(self, after: tuple[datetime, uuid.UUID] | None, limit: int) -> Sequence[Row]:
+        """``(id, video_s3_key, deleted_at)`` of claimed videos whose objects are not all deleted yet.
+
+        Keyset pagination: pass the ``(deleted_at, id)`` of the previous page's last row as ``after``.
+        """
+        statement = (
+            select(Video.id, Video.video_s3_key, Video.deleted_at)
+            .where(Video.purge_pending)
+            .order_by(Video.deleted_at, Video.id)
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(tuple_(Video.deleted_at, Video.id) > after)
+        return self.db.execute(statement).all()
+
+    async def mark_purged(self, video_ids: list[uuid.UUID]) -> None:
+        """Record that every object of these claimed videos has been deleted."""
+        statement = (
+            update(Video)
+            .where(Video.id.in_(video_ids))
+            .values(purge_pending=False)
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            self.db.execute(statement)
+            self.db.commit()
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            raise _generate_database_error(e, operation='mark_purged')
+
+
+def _stale(failed_before: datetime, in_progress_before: datetime):
+    return and_(
+        Video.deleted_at.is_(None),
+        or_(
+            and_(Video.processing_status == ProcessingStatus.FAILED, Video.updated_at < failed_before),
+            and_(Video.processing_status == ProcessingStatus.IN_PROGRESS, Video.updated_at < in_progress_before),
+        ),
+    )
+
+
+def _parse_uuids(values: list[str]) -> list[uuid.UUID]:
+    """The valid UUIDs among ``values``; anything else cannot match a row."""
+    parsed = []
+    for value in values:
+        try:
+            parsed.append(uuid.UUID(value))
+        except ValueError:
+            continue
+    return parsed
+
+
 def _generate_s3_error(exception: ClientError, operation: str = 'operation') -> InternalServerError:
     """Convert S3 ClientError to AppError."""
     error = exception.response.get("Error", {})
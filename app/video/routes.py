@@ -1,14 +1,29 @@
 from typing import TYPE_CHECKING
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, Response
 
+from app.auth.deps import get_current_db_user
+from app.auth.schemas import UserRead
+from app.core.compression import negotiate_encoding
+from app.core.config import settings
 from app.core.entities.auth_user import AuthUser
+from app.core.http_cache import (
+    PRIVATE_CACHE_CONTROL,
+    PUBLIC_CACHE_CONTROL,
+    encoded_json_response,
+    etag_matches,
+    not_modified,
+    set_cache_headers,
+)
 from app.core.middleware.auth_user import get_current_user, verify_iam_auth
 from app.video import schemas
 from app.video.deps import get_video_service
+from app.video.media import master_playlist
+from app.video.service import feed_etag, shared_cache_control, video_cache_headers
 
 if TYPE_CHECKING:
     from app.video import VideoService
+    from app.video.service import Playback
 
 router = APIRouter(prefix="/videos", tags=["Videos"])
 
@@ -34,26 +49,277 @@ async def get_presigned_thumbnail_url(
 async def upload_video_metadata(
         metadata: schemas.VideoBase,
         current_user: AuthUser = Depends(get_current_user),
+        # Videos reference the user's row; this creates it if signup never did.
+        _: UserRead = Depends(get_current_db_user),
         service: "VideoService" = Depends(get_video_service),
 ):
     return await service.save_video_metadata(current_user, metadata)
 
 
+@router.post('/metadata/bulk', response_model=schemas.BulkVideoMetadataResponse)
+async def bulk_upload_video_metadata(
+        request: schemas.BulkVideoMetadataRequest,
+        current_user: AuthUser = Depends(get_current_user),
+        _: UserRead = Depends(get_current_db_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """Register up to 1000 uploaded videos at once. Idempotent on ``video_s3_key``."""
+    return await service.bulk_save_video_metadata(current_user, request.items)
+
+
 @router.get('', response_model=list[schemas.Video])
 async def get_all_videos(
+        limit: int | None = Query(None, ge=1, le=1000),
+        offset: int = Query(0, ge=0),
+        if_none_match: str | None = Header(None),
+        accept_encoding: str | None = Header(None),
         _: AuthUser = Depends(get_current_user),
         service: "VideoService" = Depends(get_video_service),
 ):
-    return await service.get_all_videos()
+    # The version is read before the query, so a feed change racing this request
+    # leaves the response with an older ETag and the next revalidation refetches.
+    feed_version = await service.get_feed_version()
+    if feed_version is None:
+        return await service.get_all_videos(limit=limit, offset=offset)
+
+    etag = feed_etag(feed_version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PUBLIC_CACHE_CONTROL)
+
+    body, encoding = await service.get_feed_page(
+        feed_version, negotiate_encoding(accept_encoding), limit=limit, offset=offset
+    )
+    return encoded_json_response(body, encoding, etag, PUBLIC_CACHE_CONTROL)
+
+
+@router.post('/batch', response_model=schemas.VideoBatchResponse)
+async def get_video_batch(
+        request: schemas.VideoBatchRequest,
+        _: AuthUser = Depends(get_current_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """Up to 100 videos by id in one request, in request order; missing ones are marked NOT_FOUND."""
+    return await service.get_video_batch(request.ids)
+
+
+@router.get('/trending', response_model=list[schemas.Video])
+async def get_trending_videos(
+        response: Response,
+        limit: int = Query(20, ge=1, le=100),
+        _: AuthUser = Depends(get_current_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """Public videos ranked by views, with recent views weighted more (see ``TRENDING_HALF_LIFE_SECONDS``)."""
+    response.headers['Cache-Control'] = PUBLIC_CACHE_CONTROL
+    return await service.get_trending(limit)
+
+
+@router.get('/shared/{token}', response_model=schemas.Video)
+async def get_shared_video(
+        token: str,
+        response: Response,
+        service: "VideoService" = Depends(get_video_service),
+):
+    """A video opened through a share link; the token is the only credential."""
+    grant = await service.verify_share_token(token, schemas.ShareScope.VIEW)
+    video = await service.get_shared_video(grant)
+    response.headers['Cache-Control'] = shared_cache_control(grant)
+    return video
+
+
+@router.get('/shared/{token}/master.m3u8', response_class=Response)
+async def get_shared_master_playlist(
+        token: str,
+        service: "VideoService" = Depends(get_video_service),
+):
+    """HLS master playlist of a shared video; sets CloudFront cookies for PRIVATE videos when configured."""
+    grant = await service.verify_share_token(token, schemas.ShareScope.PLAYBACK)
+    playback = await service.get_shared_playback(grant)
+    await service.record_view(f'share:{grant.token_id}', str(grant.video_id), playback.visibility)
+    variants = [
+        (rendition.resolution, rendition.bitrate, rendition.codec, url)
+        for rendition, url in zip(playback.renditions, playback.variant_urls)
+    ]
+    response = Response(content=master_playlist(variants), media_type='application/vnd.apple.mpegurl')
+    _set_playback_cookies(response, playback)
+    # Signed cookies are per viewer; anything else can be cached like the shared video itself.
+    response.headers['Cache-Control'] = PRIVATE_CACHE_CONTROL if playback.cookies else shared_cache_control(grant)
+    return response
+
+
+@router.get('/shared/{token}/renditions/{index}.m3u8', response_class=Response)
+async def get_shared_media_playlist(
+        token: str,
+        index: int = Path(ge=0),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """Media playlist of a shared PRIVATE video's rendition, with presigned segment URLs."""
+    grant = await service.verify_share_token(token, schemas.ShareScope.PLAYBACK)
+    return _media_playlist_response(await service.get_shared_media_playlist(grant, index))
+
+
+@router.get('/mine', response_model=list[schemas.Video])
+async def get_my_videos(
+        response: Response,
+        limit: int | None = Query(None, ge=1, le=1000),
+        offset: int = Query(0, ge=0),
+        current_user: AuthUser = Depends(get_current_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """The caller's videos in every state; PRIVATE media come with presigned URLs."""
+    response.headers['Cache-Control'] = PRIVATE_CACHE_CONTROL
+    return await service.get_user_videos(current_user, limit=limit, offset=offset)
 
 
 @router.get('/{video_id}', response_model=schemas.Video)
 async def get_video_by_id(
         video_id: str,
+        response: Response,
+        if_none_match: str | None = Header(None),
+        accept_encoding: str | None = Header(None),
         _: AuthUser = Depends(get_current_user),
         service: "VideoService" = Depends(get_video_service),
 ):
-    return await service.get_video_by_id(video_id)
+    cached = await service.get_cached_video_response(video_id, negotiate_encoding(accept_encoding))
+    if cached is not None:
+        if etag_matches(if_none_match, cached.etag):
+            return not_modified(cached.etag, cached.cache_control)
+        if cached.body is not None:
+            return encoded_json_response(cached.body, cached.encoding, cached.etag, cached.cache_control)
+
+    video = await service.get_video_by_id(video_id)
+    set_cache_headers(response, *video_cache_headers(video))
+    return video
+
+
+@router.get('/{video_id}/playback', response_model=schemas.PlaybackResponse)
+async def get_video_playback(
+        video_id: str,
+        request: Request,
+        response: Response,
+        current_user: AuthUser = Depends(get_current_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """Master manifest URL and renditions; sets CloudFront cookies for PRIVATE videos when configured."""
+    playback = await service.get_playback(current_user, video_id)
+    await service.record_view(current_user.sub, playback.video_id, playback.visibility)
+    _set_playback_cookies(response, playback)
+    response.headers['Cache-Control'] = PRIVATE_CACHE_CONTROL
+    return schemas.PlaybackResponse(
+        manifest_url=str(request.url_for('get_master_playlist', video_id=video_id)),
+        renditions=playback.renditions,
+    )
+
+
+def _set_playback_cookies(response: Response, playback: "Playback") -> None:
+    for name, value in playback.cookies.items():
+        response.set_cookie(
+            key=name,
+            value=value,
+            max_age=settings.PRESIGNED_URL_TTL,
+            path=playback.cookie_path,
+            domain=settings.CLOUDFRONT_COOKIE_DOMAIN,
+            httponly=True,
+            samesite='none',
+            secure=True,
+        )
+
+
+@router.post('/{video_id}/share', response_model=schemas.ShareLinkResponse)
+async def create_share_link(
+        video_id: str,
+        share_request: schemas.ShareLinkRequest,
+        request: Request,
+        current_user: AuthUser = Depends(get_current_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """Signed, expiring link to one of the caller's videos, usable without signing in."""
+    token, grant = await service.create_share_link(current_user, video_id, share_request)
+    return schemas.ShareLinkResponse(
+        token=token,
+        token_id=grant.token_id,
+        expires_at=grant.expires_at,
+        video_url=(
+            str(request.url_for('get_shared_video', token=token))
+            if grant.allows(schemas.ShareScope.VIEW) else None
+        ),
+        playback_url=(
+            str(request.url_for('get_shared_master_playlist', token=token))
+            if grant.allows(schemas.ShareScope.PLAYBACK) else None
+        ),
+    )
+
+
+@router.delete('/{video_id}/share/{token_id}', status_code=204, response_class=Response)
+async def revoke_share_link(
+        video_id: str,
+        token_id: str,
+        current_user: AuthUser = Depends(get_current_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """Revoke a share link; cached copies of its responses expire within PUBLIC_CACHE_MAX_AGE."""
+    await service.revoke_share_link(current_user, video_id, token_id)
+    return Response(status_code=204)
+
+
+@router.get('/{video_id}/views', response_model=schemas.ViewStats)
+async def get_video_views(
+        video_id: str,
+        current_user: AuthUser = Depends(get_current_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """View count and unique viewers of a video the caller may watch, served from Redis."""
+    return await service.get_view_stats(current_user, video_id)
+
+
+@router.get('/{video_id}/playback/master.m3u8', response_class=Response)
+async def get_master_playlist(
+        video_id: str,
+        current_user: AuthUser = Depends(get_current_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """HLS master playlist listing every rendition, lowest bitrate first."""
+    playback = await service.get_playback(current_user, video_id, sign_cookies=False)
+    variants = [
+        (rendition.resolution, rendition.bitrate, rendition.codec, url)
+        for rendition, url in zip(playback.renditions, playback.variant_urls)
+    ]
+    return Response(
+        content=master_playlist(variants),
+        media_type='application/vnd.apple.mpegurl',
+        headers={'Cache-Control': playback.cache_control},
+    )
+
+
+@router.get('/{video_id}/playback/renditions/{index}.m3u8', response_class=Response)
+async def get_media_playlist(
+        video_id: str,
+        index: int = Path(ge=0),
+        current_user: AuthUser = Depends(get_current_user),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """Media playlist of a PRIVATE video's rendition, with presigned segment URLs (no CloudFront signing)."""
+    return _media_playlist_response(await service.get_media_playlist(current_user, video_id, index))
+
+
+def _media_playlist_response(playlist: str) -> Response:
+    # The segment URLs are signed for this video's viewers; no shared cache may keep them.
+    return Response(
+        content=playlist,
+        media_type='application/vnd.apple.mpegurl',
+        headers={'Cache-Control': PRIVATE_CACHE_CONTROL},
+    )
+
+
+@router.put('/{video_id}/renditions', response_model=None, include_in_schema=False)
+async def register_video_renditions(
+        video_id: str,
+        registration: schemas.RenditionRegistration,
+        _: str = Depends(verify_iam_auth),
+        service: "VideoService" = Depends(get_video_service),
+):
+    """Register the renditions the transcoder produced. IAM-authenticated endpoint for service-to-service communication."""
+    return await service.register_renditions(video_id, registration)
 
 
 @router.get('/by-key/{s3_key:path}', response_model=schemas.VideoIdResponse, include_in_schema=False)
@@ -1,6 +1,10 @@
+import enum
 from uuid import UUID
 
-from pydantic import ConfigDict, BaseModel
+from pydantic import ConfigDict, BaseModel, Field
+
+MAX_BULK_METADATA_ITEMS = 1000
+MAX_BATCH_VIDEO_IDS = 100
 
 
 class MediaUploadResponse(BaseModel):
@@ -23,6 +27,94 @@ class Video(VideoBase):
     id: UUID | str
     user_id: str
     processing_status: str  # Should be one of "IN_PROGRESS", "COMPLETED", "FAILED"
+    size_bytes: int | None = None
+    thumbnail_url: str | None = None
+    # Set once processing has completed
+    playback_url: str | None = None
+    version: int = 1
+
+
+class BulkVideoMetadataRequest(BaseModel):
+    items: list[VideoBase] = Field(min_length=1, max_length=MAX_BULK_METADATA_ITEMS)
+
+
+class BulkItemStatus(str, enum.Enum):
+    CREATED = "CREATED"
+    EXISTS = "EXISTS"  # The caller already registered this key; ``id`` is the existing video
+    CONFLICT = "CONFLICT"  # Another user owns this key
+    INVALID = "INVALID"
+
+
+class BulkVideoMetadataResult(BaseModel):
+    index: int
+    video_s3_key: str
+    status: BulkItemStatus
+    id: UUID | str | None = None
+    error: str | None = None
+
+
+class BulkVideoMetadataResponse(BaseModel):
+    created: int
+    results: list[BulkVideoMetadataResult]
+
+
+class RenditionBase(BaseModel):
+    resolution: str = Field(pattern=r'^\d+x\d+$')
+    bitrate: int = Field(gt=0)
+    codec: str
+    manifest_key: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RenditionRegistration(BaseModel):
+    renditions: list[RenditionBase] = Field(min_length=1, max_length=64)
+
+
+class PlaybackResponse(BaseModel):
+    manifest_url: str
+    renditions: list[RenditionBase]
+
+
+class VideoBatchRequest(BaseModel):
+    ids: list[str] = Field(min_length=1, max_length=MAX_BATCH_VIDEO_IDS)
+
+
+class VideoBatchResult(BaseModel):
+    id: str
+    video: Video | None = None
+    error: str | None = None  # "NOT_FOUND" when the video does not exist or is not viewable
+
+
+class VideoBatchResponse(BaseModel):
+    results: list[VideoBatchResult]
+
+
+class ViewStats(BaseModel):
+    video_id: str
+    views: int
+    # HyperLogLog estimate, within about 1%
+    unique_viewers: int
+
+
+class ShareScope(str, enum.Enum):
+    VIEW = "view"  # the video's metadata, as GET /videos/{id}
+    PLAYBACK = "playback"  # the HLS master playlist
+
+
+class ShareLinkRequest(BaseModel):
+    # Defaults to SHARE_TOKEN_DEFAULT_TTL; capped at SHARE_TOKEN_MAX_TTL
+    ttl_seconds: int | None = Field(None, gt=0)
+    scopes: list[ShareScope] = Field(default_factory=lambda: [ShareScope.VIEW, ShareScope.PLAYBACK], min_length=1)
+
+
+class ShareLinkResponse(BaseModel):
+    token: str
+    # Pass to DELETE /videos/{video_id}/share/{token_id} to revoke the link
+    token_id: str
+    expires_at: int
+    video_url: str | None = None
+    playback_url: str | None = None
 
 
 class VideoIdResponse(BaseModel):
@@ -1,19 +1,118 @@
+import asyncio
 import logging
+import time
 import uuid
+from dataclasses import dataclass
+from urllib.parse import urlsplit
 
+from pydantic import TypeAdapter
 from redis import Redis
 
+from app.core import cloudfront
+from app.core.compression import encode_variants
+from app.core.config import settings
 from app.core.entities.auth_user import AuthUser
-from app.video import VideoRepository, schemas
-from app.video.models import ProcessingStatus
+from app.core.exceptions import (
+    ConflictError,
+    DomainValidationError,
+    NotFoundError,
+    ServiceUnavailableError,
+    UnauthorizedError,
+)
+from app.core.http_cache import PRIVATE_CACHE_CONTROL, PUBLIC_CACHE_CONTROL, make_etag
+from app.core.metrics import record_cache_lookup
+from app.video import VideoRepository, schemas, share
+from app.video.media import (
+    media_playlist_keys,
+    media_playlist_uri,
+    playback_manifest_key,
+    playback_prefix,
+    public_url,
+    rewrite_media_playlist,
+    thumbnail_key,
+)
+from app.video.models import ProcessingStatus, Video, VisibilityStatus
+from app.video.repository import S3ObjectInfo
+from app.video.views import ViewCounter
 
 logger = logging.getLogger(__name__)
 
+VIDEO_CACHE_TTL = 3600
+FEED_VERSION_KEY = 'videos:feed:version'
+
+_video_list_adapter = TypeAdapter(list[schemas.Video])
+_rendition_list_adapter = TypeAdapter(list[schemas.RenditionBase])
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """A cached HTTP representation: validators plus the body in the requested encoding, if cached."""
+
+    etag: str
+    cache_control: str
+    body: bytes | None
+    encoding: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class Playback:
+    """What a viewer needs to stream a video: its variants, their URLs and any CloudFront cookies."""
+
+    video_id: str
+    renditions: list[schemas.RenditionBase]
+    variant_urls: list[str]
+    visibility: str
+    cache_control: str
+    # Cookie name -> value; empty unless the video is PRIVATE and CloudFront signing is configured
+    cookies: dict[str, str]
+    cookie_path: str | None = None
+
+
+def video_cache_headers(video: schemas.Video) -> tuple[str, str]:
+    """ETag and Cache-Control for a single video representation."""
+    return make_etag(video.id, video.version), _cache_control_for(video.visibility)
+
+
+def shared_cache_control(grant: share.ShareGrant) -> str:
+    """Shared responses are addressed by their token, so shared caches may keep them, never past its expiry.
+
+    Revoking a link takes effect everywhere once these copies expire.
+    """
+    max_age = max(0, min(settings.PUBLIC_CACHE_MAX_AGE, grant.expires_at - int(time.time())))
+    return f'public, max-age={max_age}'
+
+
+def feed_etag(feed_version: str) -> str:
+    return make_etag('feed', feed_version)
+
+
+def _owns_key(user: AuthUser, video_s3_key: str) -> bool:
+    """Whether the key is under the caller's upload prefix, as handed out by ``generate_presigned_video_url``."""
+    return video_s3_key.startswith(f'videos/{user.sub}/')
+
+
+def _canonical_id(video_id: str) -> str | None:
+    """The id in the form videos are keyed by in Postgres and Redis, or None if it is not a UUID."""
+    try:
+        return str(uuid.UUID(video_id))
+    except ValueError:
+        return None
+
+
+def _canonical_ids(video_ids: list[str]) -> list[str]:
+    """Canonical forms of the valid ids, in order and without duplicates."""
+    return list(dict.fromkeys(filter(None, map(_canonical_id, video_ids))))
+
+
+def _cache_control_for(visibility: str) -> str:
+    return PUBLIC_CACHE_CONTROL if visibility == VisibilityStatus.PUBLIC.value else PRIVATE_CACHE_CONTROL
+
 
 class VideoService:
-    def __init__(self, video_repo: VideoRepository, redis_client: Redis):
+    def __init__(self, video_repo: VideoRepository, redis_client: Redis, redis_bytes_client: Redis):
         self.video_repo = video_repo
         self.redis = redis_client
+        self.redis_bytes = redis_bytes_client
 
     async def generate_presigned_video_url(self, user: AuthUser) -> schemas.MediaUploadResponse:
         video_id = f'videos/{user.sub}/{uuid.uuid4()}.mp4'
@@ -22,7 +121,7 @@ class VideoService:
         return schemas.MediaUploadResponse(url=url, media_id=video_id)
 
     async def generate_presigned_thumbnail_url(self, thumbnail_id: str) -> schemas.MediaUploadResponse:
-        thumbnail_id = thumbnail_id.replace('videos/', 'thumbnails/').replace('.mp4', '.jpg')
+        thumbnail_id = thumbnail_key(thumbnail_id)
         url = await self.video_repo.generate_presigned_thumbnail_url(thumbnail_id)
 
         return schemas.MediaUploadResponse(url=url, media_id=thumbnail_id)
@@ -31,27 +130,240 @@ class VideoService:
         if metadata.visibility.lower() not in {"public", "private", "unlisted"}:
             raise ValueError("Invalid visibility value")
 
+        if not _owns_key(user, metadata.video_s3_key):
+            raise DomainValidationError("Video key does not belong to the current user")
+        uploaded = await self._head_uploaded_object(metadata.video_s3_key)
+        if uploaded is None:
+            raise DomainValidationError("No video has been uploaded under this key")
+
         video = await self.video_repo.save_video_metadata(
             user_id=user.sub,
             title=metadata.title,
             description=metadata.description,
             video_s3_key=metadata.video_s3_key,
             visibility=metadata.visibility.upper(),
+            size_bytes=uploaded.size,
+            s3_etag=uploaded.etag,
         )
-        return schemas.Video.model_validate(video)
+        if video is None:
+            raise ConflictError("Video key is already registered")
+        return (await self._with_media_urls([schemas.Video.model_validate(video)]))[0]
+
+    async def bulk_save_video_metadata(
+            self, user: AuthUser, items: list[schemas.VideoBase]
+    ) -> schemas.BulkVideoMetadataResponse:
+        """Register many videos for ``user`` in one statement, reporting a result per item, in request order.
+
+        Keys already registered by ``user`` (including repeats within the batch)
+        come back as EXISTS with the existing id, so a retried batch is safe.
+        """
+        results: list[schemas.BulkVideoMetadataResult | None] = [None] * len(items)
+
+        def invalid(index: int, error: str) -> schemas.BulkVideoMetadataResult:
+            return schemas.BulkVideoMetadataResult(
+                index=index, video_s3_key=items[index].video_s3_key,
+                status=schemas.BulkItemStatus.INVALID, error=error,
+            )
+
+        for index, item in enumerate(items):
+            if item.visibility.lower() not in {"public", "private", "unlisted"}:
+                results[index] = invalid(index, "Invalid visibility value")
+            elif not _owns_key(user, item.video_s3_key):
+                results[index] = invalid(index, "Video key does not belong to the current user")
+
+        keys = list(dict.fromkeys(item.video_s3_key for index, item in enumerate(items) if results[index] is None))
+        uploads = dict(zip(keys, await self._head_uploaded_objects(keys)))
+
+        pending: dict[str, dict] = {}
+        for index, item in enumerate(items):
+            if results[index] is not None:
+                continue
+            uploaded = uploads[item.video_s3_key]
+            if uploaded is None:
+                results[index] = invalid(index, "No video has been uploaded under this key")
+                continue
+            pending.setdefault(item.video_s3_key, {
+                'title': item.title,
+                'description': item.description,
+                'video_s3_key': item.video_s3_key,
+                'visibility': item.visibility.upper(),
+                'size_bytes': uploaded.size,
+                's3_etag': uploaded.etag,
+            })
+
+        inserted = await self.video_repo.bulk_save_video_metadata(user.sub, list(pending.values())) if pending else {}
+        existing = await self.video_repo.get_video_owners_by_s3_keys([key for key in pending if key not in inserted])
+
+        reported: set[str] = set()
+        for index, item in enumerate(items):
+            if results[index] is not None:
+                continue
+            key = item.video_s3_key
+            if key in inserted and key not in reported:
+                status, video_id = schemas.BulkItemStatus.CREATED, inserted[key]
+            elif key in inserted:
+                status, video_id = schemas.BulkItemStatus.EXISTS, inserted[key]
+            elif key in existing and existing[key][1] == user.sub:
+                status, video_id = schemas.BulkItemStatus.EXISTS, existing[key][0]
+            else:
+                status, video_id = schemas.BulkItemStatus.CONFLICT, None
+            reported.add(key)
+            results[index] = schemas.BulkVideoMetadataResult(
+                index=index, video_s3_key=key, status=status, id=video_id,
+            )
+
+        return schemas.BulkVideoMetadataResponse(created=len(inserted), results=results)
+
+    async def _head_uploaded_object(self, video_s3_key: str) -> S3ObjectInfo | None:
+        """HEAD of the raw upload, reused from Redis for ``S3_HEAD_CACHE_TTL`` seconds.
+
+        Only objects that exist are cached, so a client that submits metadata
+        before its upload finishes succeeds as soon as it retries.
+        """
+        cache_key = f's3:head:{video_s3_key}'
+
+        try:
+            cached = self.redis.get(cache_key)
+            if cached:
+                record_cache_lookup('s3_head', 'hit')
+                size, etag = cached.split('|', 1)
+                return S3ObjectInfo(size=int(size), etag=etag)
+            record_cache_lookup('s3_head', 'miss')
+        except Exception as e:
+            record_cache_lookup('s3_head', 'error')
+            logger.error(f"Redis error: {e}")
+
+        uploaded = await self.video_repo.head_video_object(video_s3_key)
+        if uploaded is not None:
+            try:
+                self.redis.set(cache_key, f'{uploaded.size}|{uploaded.etag}', ex=settings.S3_HEAD_CACHE_TTL)
+            except Exception as e:
+                logger.error(f"Redis error: {e}")
+        return uploaded
+
+    async def _head_uploaded_objects(self, video_s3_keys: list[str]) -> list[S3ObjectInfo | None]:
+        # Bounded by the S3 client's connection pool so a large batch does not queue on it.
+        semaphore = asyncio.Semaphore(settings.AWS_MAX_POOL_CONNECTIONS)
+
+        async def head(video_s3_key: str) -> S3ObjectInfo | None:
+            async with semaphore:
+                return await self._head_uploaded_object(video_s3_key)
+
+        return await asyncio.gather(*(head(key) for key in video_s3_keys))
+
+    async def get_all_videos(self, limit: int | None = None, offset: int = 0) -> list[schemas.Video]:
+        videos = await self.video_repo.get_all_videos(limit=limit, offset=offset)
+        return await self._with_media_urls([schemas.Video.model_validate(video) for video in videos])
+
+    async def get_user_videos(self, user: AuthUser, limit: int | None = None, offset: int = 0) -> list[schemas.Video]:
+        """The caller's own videos in every visibility and processing state."""
+        videos = await self.video_repo.get_videos_by_user(user.sub, limit=limit, offset=offset)
+        return await self._with_media_urls([schemas.Video.model_validate(video) for video in videos])
 
-    async def get_all_videos(self) -> list[schemas.Video]:
-        videos = await self.video_repo.get_all_videos()
-        return [schemas.Video.model_validate(video) for video in videos]
+    async def _with_media_urls(self, videos: list[schemas.Video]) -> list[schemas.Video]:
+        """Fill in thumbnail and playback URLs.
+
+        PUBLIC and UNLISTED media get stable CDN/S3 URLs. PRIVATE media get
+        presigned GET URLs: the whole page is looked up with one MGET, the
+        misses are signed together and written back in one pipeline.
+        """
+        private: list[tuple[schemas.Video, str, tuple[str, str]]] = []
+        for video in videos:
+            objects = [('thumbnail_url', settings.S3_VIDEO_THUMBNAILS_BUCKET, thumbnail_key(video.video_s3_key))]
+            if video.processing_status == ProcessingStatus.COMPLETED.value:
+                objects.append((
+                    'playback_url', settings.S3_PROCESSED_VIDEOS_BUCKET, playback_manifest_key(video.video_s3_key)
+                ))
+            for field, bucket, key in objects:
+                if video.visibility == VisibilityStatus.PRIVATE.value:
+                    private.append((video, field, (bucket, key)))
+                else:
+                    setattr(video, field, public_url(bucket, key))
+
+        if private:
+            urls = await self._presigned_get_urls([bucket_key for _, _, bucket_key in private])
+            for (video, field, _), url in zip(private, urls):
+                setattr(video, field, url)
+        return videos
+
+    async def _presigned_get_urls(self, objects: list[tuple[str, str]]) -> list[str]:
+        """Presigned GET URLs for ``(bucket, key)`` pairs, reused from Redis until shortly before they expire."""
+        cache_keys = [f'presigned:{bucket}/{key}' for bucket, key in objects]
+        try:
+            urls = self.redis.mget(cache_keys)
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            urls = [None] * len(objects)
+
+        missing = [index for index, url in enumerate(urls) if url is None]
+        record_cache_lookup('presigned_url', 'hit', len(urls) - len(missing))
+        if not missing:
+            return urls
+        record_cache_lookup('presigned_url', 'miss', len(missing))
+
+        signed = await self.video_repo.generate_presigned_get_urls(
+            [objects[index] for index in missing], expires_in=settings.PRESIGNED_URL_TTL
+        )
+        for index, url in zip(missing, signed):
+            urls[index] = url
+
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            for index in missing:
+                pipeline.set(
+                    cache_keys[index], urls[index],
+                    ex=settings.PRESIGNED_URL_TTL - settings.PRESIGNED_URL_REFRESH_MARGIN,
+                )
+            pipeline.execute()
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+        return urls
+
+    async def get_feed_page(
+            self, feed_version: str, encoding: str | None, limit: int | None, offset: int
+    ) -> tuple[bytes, str | None]:
+        """Serialised feed page and the encoding it is in, cached per feed version with every encoding precomputed.
+
+        Falls back to identity when the page is too small to have been compressed.
+        """
+        cache_key = f'videos:feed:{feed_version}:{limit or "all"}:{offset}'
+
+        try:
+            encoded, identity = self.redis_bytes.hmget(cache_key, [encoding or 'identity', 'identity'])
+            if identity is not None:
+                record_cache_lookup('feed', 'hit')
+                return (encoded, encoding) if encoded is not None else (identity, None)
+            record_cache_lookup('feed', 'miss')
+        except Exception as e:
+            record_cache_lookup('feed', 'error')
+            logger.error(f"Redis error: {e}")
+
+        videos = await self.get_all_videos(limit=limit, offset=offset)
+        variants = encode_variants(_video_list_adapter.dump_json(videos))
+
+        try:
+            pipeline = self.redis_bytes.pipeline(transaction=False)
+            pipeline.hset(cache_key, mapping=variants)
+            pipeline.expire(cache_key, settings.FEED_CACHE_TTL)
+            pipeline.execute()
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+
+        if encoding in variants:
+            return variants[encoding], encoding
+        return variants['identity'], None
 
     async def get_video_by_id(self, video_id: str) -> schemas.Video:
         cache_key = f'video:{video_id}'
 
         try:
-            cached_video = await self.redis.get(cache_key)
+            cached_video = self.redis.get(cache_key)
             if cached_video:
+                record_cache_lookup('video', 'hit')
                 return schemas.Video.model_validate_json(cached_video)
+            record_cache_lookup('video', 'miss')
         except Exception as e:
+            record_cache_lookup('video', 'error')
             logger.error(f"Redis error: {e}")
 
         video = await self.video_repo.get_video_by_id(video_id)
@@ -59,19 +371,437 @@ class VideoService:
         if not video:
             raise ValueError("Video not found")
 
-        schema_video = schemas.Video.model_validate(video)
+        schema_video = (await self._with_media_urls([schemas.Video.model_validate(video)]))[0]
+        await self._cache_video(schema_video)
+        return schema_video
+
+    async def get_cached_video_response(self, video_id: str, encoding: str | None) -> CachedResponse | None:
+        """Validators and pre-encoded body of the cached video, read in one round trip without touching Postgres."""
+        try:
+            stamp, encoded, identity = self.redis_bytes.hmget(
+                f'video:{video_id}:http', ['stamp', encoding or 'identity', 'identity']
+            )
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            return None
+
+        if not stamp:
+            return None
+        visibility, etag = stamp.decode().split('|', 1)
+        cache_control = _cache_control_for(visibility)
+        if encoded is not None:
+            return CachedResponse(etag=etag, cache_control=cache_control, body=encoded, encoding=encoding)
+        return CachedResponse(etag=etag, cache_control=cache_control, body=identity)
+
+    async def _cache_video(self, video: schemas.Video) -> None:
+        await self._cache_videos([video])
+
+    async def _cache_videos(self, videos: list[schemas.Video]) -> None:
+        """Cache videos as JSON, plus their HTTP representations (validators and every encoding)."""
+        try:
+            json_pipeline = self.redis.pipeline(transaction=False)
+            http_pipeline = self.redis_bytes.pipeline(transaction=False)
+            for video in videos:
+                cache_key = f'video:{video.id}'
+                body = video.model_dump_json()
+                etag, _ = video_cache_headers(video)
+
+                json_pipeline.set(cache_key, body, ex=VIDEO_CACHE_TTL)
+                http_pipeline.hset(
+                    f'{cache_key}:http',
+                    mapping={'stamp': f'{video.visibility}|{etag}', **encode_variants(body.encode())},
+                )
+                http_pipeline.expire(f'{cache_key}:http', VIDEO_CACHE_TTL)
+            json_pipeline.execute()
+            http_pipeline.execute()
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+
+    async def get_feed_version(self) -> str | None:
+        """Current version stamp of the public feed; changes whenever the feed may have changed."""
+        try:
+            # Stamps come from the clock so a reseeded key never repeats one handed out before a Redis flush.
+            pipeline = self.redis.pipeline(transaction=False)
+            pipeline.set(FEED_VERSION_KEY, time.time_ns(), nx=True)
+            pipeline.get(FEED_VERSION_KEY)
+            return pipeline.execute()[1]
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            return None
+
+    async def _invalidate_video(self, video_id: str) -> None:
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            pipeline.delete(f'video:{video_id}', f'video:{video_id}:http')
+            pipeline.set(FEED_VERSION_KEY, time.time_ns())
+            pipeline.execute()
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+
+    async def register_renditions(self, video_id: str, registration: schemas.RenditionRegistration) -> None:
+        # A manifest listed twice would make the upsert touch one row twice; the last entry wins.
+        renditions = {rendition.manifest_key: rendition.model_dump() for rendition in registration.renditions}
+        await self.video_repo.save_renditions(video_id, list(renditions.values()))
+        bucket = settings.S3_PROCESSED_VIDEOS_BUCKET
+        try:
+            self.redis.delete(
+                f'video:{video_id}:renditions',
+                *(f'presigned-playlist:{bucket}/{manifest_key}' for manifest_key in renditions),
+            )
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+
+    async def get_playback(self, user: AuthUser, video_id: str, sign_cookies: bool = True) -> Playback:
+        """Variants of a video the user may watch, with URLs the player can fetch.
+
+        PUBLIC and UNLISTED variants point at the CDN. PRIVATE variants are
+        covered by CloudFront signed cookies for the video's prefix when
+        signing is configured. Otherwise they point at media playlists served
+        through the API with a presigned URL per segment (``get_media_playlist``).
+        """
+        video = await self.video_repo.get_playable_video(video_id, user.sub)
+        if not video:
+            raise NotFoundError("Video not found")
+        return await self._playback_for(video, sign_cookies)
+
+    async def _playback_for(self, video: Video, sign_cookies: bool) -> Playback:
+        video_id = str(video.id)
+        renditions = await self._get_renditions(video_id)
+        if not renditions:
+            raise NotFoundError("Video has no renditions")
+
+        bucket = settings.S3_PROCESSED_VIDEOS_BUCKET
+        cookies, cookie_path = {}, None
+        if video.visibility != VisibilityStatus.PRIVATE:
+            variant_urls = [public_url(bucket, rendition.manifest_key) for rendition in renditions]
+        elif cloudfront.signed_cookies_enabled():
+            variant_urls = [public_url(bucket, rendition.manifest_key) for rendition in renditions]
+            if sign_cookies:
+                prefix_url = public_url(bucket, playback_prefix(video.video_s3_key))
+                cookies = cloudfront.signed_cookies(
+                    f'{prefix_url}*', expires_at=int(time.time()) + settings.PRESIGNED_URL_TTL
+                )
+                cookie_path = urlsplit(prefix_url).path
+        else:
+            # Relative to the master playlist, so the owner's and the shared routes both resolve them.
+            variant_urls = [media_playlist_uri(index) for index in range(len(renditions))]
+
+        return Playback(
+            video_id=video_id,
+            renditions=renditions,
+            variant_urls=variant_urls,
+            visibility=video.visibility.value,
+            cache_control=_cache_control_for(video.visibility.value),
+            cookies=cookies,
+            cookie_path=cookie_path,
+        )
+
+    async def get_media_playlist(self, user: AuthUser, video_id: str, index: int) -> str:
+        video = await self.video_repo.get_playable_video(video_id, user.sub)
+        if not video:
+            raise NotFoundError("Video not found")
+        return await self._signed_media_playlist(video, index)
+
+    async def _signed_media_playlist(self, video: Video, index: int) -> str:
+        """Media playlist of the ``index``-th rendition with a presigned URL per segment.
+
+        A presigned playlist URL alone is not enough: the segments it lists
+        are relative to it and would be fetched unsigned. The rewritten
+        playlist is cached in Redis until shortly before its URLs expire.
+        """
+        renditions = await self._get_renditions(str(video.id))
+        if index >= len(renditions):
+            raise NotFoundError("Rendition not found")
+
+        bucket = settings.S3_PROCESSED_VIDEOS_BUCKET
+        manifest_key = renditions[index].manifest_key
+        cache_key = f'presigned-playlist:{bucket}/{manifest_key}'
+        try:
+            cached = self.redis.get(cache_key)
+            if cached:
+                record_cache_lookup('media_playlist', 'hit')
+                return cached
+            record_cache_lookup('media_playlist', 'miss')
+        except Exception as e:
+            record_cache_lookup('media_playlist', 'error')
+            logger.error(f"Redis error: {e}")
+
+        playlist = await self.video_repo.get_object_text(bucket, manifest_key)
+        if playlist is None:
+            raise NotFoundError("Rendition not found")
+        # Only the video's own objects get signed, whatever the playlist points at.
+        prefix = playback_prefix(video.video_s3_key)
+        keys = [key for key in media_playlist_keys(playlist, manifest_key) if key.startswith(prefix)]
+        urls = await self.video_repo.generate_presigned_get_urls(
+            [(bucket, key) for key in keys], expires_in=settings.PRESIGNED_URL_TTL
+        )
+        signed = rewrite_media_playlist(playlist, manifest_key, dict(zip(keys, urls)))
 
         try:
-            await self.redis.set(
-                cache_key,
-                schema_video.model_dump_json(),
-                ex=3600
+            self.redis.set(
+                cache_key, signed,
+                ex=max(1, settings.PRESIGNED_URL_TTL - settings.PRESIGNED_URL_REFRESH_MARGIN),
             )
         except Exception as e:
             logger.error(f"Redis error: {e}")
+        return signed
+
+    async def _get_renditions(self, video_id: str) -> list[schemas.RenditionBase]:
+        cache_key = f'video:{video_id}:renditions'
+
+        try:
+            cached = self.redis.get(cache_key)
+            if cached:
+                record_cache_lookup('renditions', 'hit')
+                return _rendition_list_adapter.validate_json(cached)
+            record_cache_lookup('renditions', 'miss')
+        except Exception as e:
+            record_cache_lookup('renditions', 'error')
+            logger.error(f"Redis error: {e}")
+
+        renditions = [
+            schemas.RenditionBase.model_validate(rendition)
+            for rendition in await self.video_repo.get_renditions(video_id)
+        ]
+        if renditions:
+            try:
+                self.redis.set(cache_key, _rendition_list_adapter.dump_json(renditions), ex=VIDEO_CACHE_TTL)
+            except Exception as e:
+                logger.error(f"Redis error: {e}")
+        return renditions
+
+    async def record_view(self, viewer: str, video_id: str, visibility: str) -> None:
+        try:
+            ViewCounter(self.redis).record(
+                video_id, viewer=viewer, trending=visibility == VisibilityStatus.PUBLIC.value
+            )
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+
+    async def create_share_link(
+            self, user: AuthUser, video_id: str, request: schemas.ShareLinkRequest
+    ) -> tuple[str, share.ShareGrant]:
+        """Sign a share token for one of the user's videos."""
+        if not share.sharing_enabled():
+            raise DomainValidationError("Share links are not enabled")
+        owned_video_id = await self._owned_video_id(user, video_id)
+
+        ttl_seconds = min(request.ttl_seconds or settings.SHARE_TOKEN_DEFAULT_TTL, settings.SHARE_TOKEN_MAX_TTL)
+        return share.issue_share_token(owned_video_id, request.scopes, ttl_seconds)
+
+    async def revoke_share_link(self, user: AuthUser, video_id: str, token_id: str) -> None:
+        """Deny the token id until any token carrying it must have expired anyway.
+
+        Verification fails open while Redis is down, so a failed write is reported
+        as 503 for the owner to retry rather than leaving the link silently valid.
+        """
+        await self._owned_video_id(user, video_id)
+        try:
+            self.redis.set(share.revoked_token_key(token_id), video_id, ex=settings.SHARE_TOKEN_MAX_TTL)
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            raise ServiceUnavailableError("Share link could not be revoked; try again") from e
+
+    async def _owned_video_id(self, user: AuthUser, video_id: str) -> uuid.UUID:
+        try:
+            parsed_id = uuid.UUID(video_id)
+        except ValueError:
+            raise NotFoundError("Video not found")
+        if await self.video_repo.get_video_owner(video_id) != user.sub:
+            raise NotFoundError("Video not found")
+        return parsed_id
+
+    async def verify_share_token(self, token: str, scope: schemas.ShareScope) -> share.ShareGrant:
+        """Check the signature, expiry and scope locally, then the denylist.
+
+        A Redis outage skips the denylist check (logged) rather than breaking every shared link.
+        """
+        if not share.sharing_enabled():
+            raise NotFoundError("Video not found")
+        grant = share.verify_share_token(token, scope)
+        try:
+            revoked = self.redis.exists(share.revoked_token_key(grant.token_id))
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            revoked = False
+        if revoked:
+            raise UnauthorizedError("Share link has been revoked")
+        return grant
 
+    async def get_shared_video(self, grant: share.ShareGrant) -> schemas.Video:
+        """The shared video, from the per-video cache when it holds it (PUBLIC/UNLISTED) and Postgres otherwise."""
+        video_id = str(grant.video_id)
+        try:
+            cached_video = self.redis.get(f'video:{video_id}')
+            if cached_video:
+                record_cache_lookup('video', 'hit')
+                return schemas.Video.model_validate_json(cached_video)
+            record_cache_lookup('video', 'miss')
+        except Exception as e:
+            record_cache_lookup('video', 'error')
+            logger.error(f"Redis error: {e}")
+
+        video = await self.video_repo.get_completed_video(video_id)
+        if not video:
+            raise NotFoundError("Video not found")
+        schema_video = (await self._with_media_urls([schemas.Video.model_validate(video)]))[0]
+        # PRIVATE videos must never land in the cache GET /videos/{id} serves from.
+        if schema_video.visibility != VisibilityStatus.PRIVATE.value:
+            await self._cache_video(schema_video)
         return schema_video
 
+    async def get_shared_playback(self, grant: share.ShareGrant, sign_cookies: bool = True) -> Playback:
+        video = await self.video_repo.get_completed_video(str(grant.video_id))
+        if not video:
+            raise NotFoundError("Video not found")
+        return await self._playback_for(video, sign_cookies)
+
+    async def get_shared_media_playlist(self, grant: share.ShareGrant, index: int) -> str:
+        video = await self.video_repo.get_completed_video(str(grant.video_id))
+        if not video:
+            raise NotFoundError("Video not found")
+        return await self._signed_media_playlist(video, index)
+
+    async def get_trending(self, limit: int) -> list[schemas.Video]:
+        """Top videos by time-decayed views.
+
+        Ids come from the trending sorted set and are hydrated from the
+        per-video cache with one MGET; only misses reach Postgres, and those
+        are cached again in one pipeline. Videos that are no longer public
+        are dropped from the ranking.
+        """
+        counter = ViewCounter(self.redis)
+        try:
+            # Read past ``limit`` so videos dropped below still leave a full page.
+            video_ids = counter.trending(limit * 2)
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            return []
+
+        videos = await self.get_videos_by_ids(video_ids)
+        public = [
+            video for video in videos
+            if video is not None
+            and video.visibility == VisibilityStatus.PUBLIC.value
+            and video.processing_status == ProcessingStatus.COMPLETED.value
+        ]
+
+        public_ids = {str(video.id) for video in public}
+        dropped = [video_id for video_id in video_ids if video_id not in public_ids]
+        if dropped:
+            try:
+                counter.remove_from_trending(dropped)
+            except Exception as e:
+                logger.error(f"Redis error: {e}")
+        return public[:limit]
+
+    async def get_video_batch(self, video_ids: list[str]) -> schemas.VideoBatchResponse:
+        videos = await self.get_videos_by_ids(video_ids)
+        return schemas.VideoBatchResponse(results=[
+            schemas.VideoBatchResult(id=video_id, video=video)
+            if video is not None else schemas.VideoBatchResult(id=video_id, error='NOT_FOUND')
+            for video_id, video in zip(video_ids, videos)
+        ])
+
+    async def get_videos_by_ids(self, video_ids: list[str]) -> list[schemas.Video | None]:
+        """Videos in ``video_ids`` order, None where not found or not viewable.
+
+        One MGET against the per-video cache, one query for the misses, and
+        one pipeline to cache what the query found.
+        """
+        # Cache keys and rows use the canonical id; ids that are not UUIDs cannot match and skip the lookups.
+        canonical = [_canonical_id(video_id) for video_id in video_ids]
+        unique_ids = list(dict.fromkeys(filter(None, canonical)))
+        if not unique_ids:
+            return [None] * len(video_ids)
+
+        try:
+            cached = self.redis.mget([f'video:{video_id}' for video_id in unique_ids])
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            cached = [None] * len(unique_ids)
+
+        found = {
+            video_id: schemas.Video.model_validate_json(body)
+            for video_id, body in zip(unique_ids, cached) if body is not None
+        }
+        record_cache_lookup('video', 'hit', len(found))
+        record_cache_lookup('video', 'miss', len(unique_ids) - len(found))
+        missing = [video_id for video_id in unique_ids if video_id not in found]
+
+        if missing:
+            loaded = await self._with_media_urls([
+                schemas.Video.model_validate(video) for video in await self.video_repo.get_videos_by_ids(missing)
+            ])
+            await self._cache_videos(loaded)
+            found.update((str(video.id), video) for video in loaded)
+
+        return [found.get(video_id) if video_id else None for video_id in canonical]
+
+    async def get_view_counts(self, video_ids: list[str]) -> dict[str, int]:
+        """View totals from Redis, rebuilt from Postgres plus buffered deltas for ids Redis has not seen.
+
+        Unknown ids are left out; results are keyed by the canonical id.
+        """
+        video_ids = _canonical_ids(video_ids)
+        counter = ViewCounter(self.redis)
+        try:
+            counts = counter.cached_counts(video_ids)
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            return await self.video_repo.get_view_counts(video_ids)
+
+        missing = [video_id for video_id in video_ids if video_id not in counts]
+        record_cache_lookup('views', 'hit', len(counts))
+        if not missing:
+            return counts
+        record_cache_lookup('views', 'miss', len(missing))
+
+        lock = counter.seed_lock()
+        try:
+            locked = lock.acquire(blocking=False)
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            return {**counts, **await self.video_repo.get_view_counts(missing)}
+
+        try:
+            stored = await self.video_repo.get_view_counts(missing)
+            try:
+                if locked:
+                    seeded = counter.seed_counts(stored)
+                else:
+                    # A flush is running: report the current total, but leave seeding to a later read.
+                    deltas = counter.buffered_deltas(list(stored))
+                    seeded = {video_id: views + deltas[video_id] for video_id, views in stored.items()}
+            except Exception as e:
+                logger.error(f"Redis error: {e}")
+                seeded = stored
+        finally:
+            if locked:
+                try:
+                    lock.release()
+                except Exception as e:
+                    logger.error(f"Redis error: {e}")
+        return {**counts, **seeded}
+
+    async def get_view_stats(self, user: AuthUser, video_id: str) -> schemas.ViewStats:
+        """Views of a video the user may watch; the same access rule as playback."""
+        canonical_id = _canonical_id(video_id)
+        video = canonical_id and await self.video_repo.get_playable_video(canonical_id, user.sub)
+        if not video:
+            raise NotFoundError("Video not found")
+        video_id = str(video.id)
+        counts = await self.get_view_counts([video_id])
+        if video_id not in counts:
+            raise NotFoundError("Video not found")
+
+        try:
+            unique_viewers = ViewCounter(self.redis).unique_viewers(video_id)
+        except Exception as e:
+            logger.error(f"Redis error: {e}")
+            unique_viewers = 0
+        return schemas.ViewStats(video_id=video_id, views=counts[video_id], unique_viewers=unique_viewers)
+
     async def get_video_id_by_s3_key(self, s3_key: str) -> schemas.VideoIdResponse:
         video = await self.video_repo.get_video_by_s3_key(s3_key)
         if not video:
@@ -83,3 +813,4 @@ class VideoService:
             raise ValueError('Invalid processing status')
 
         await self.video_repo.update_video_processing_status(video_id=video_id, status=ProcessingStatus[status.upper()])
+        await self._invalidate_video(video_id)
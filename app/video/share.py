@@ -0,0 +1,91 @@
+"""Signed share tokens granting access to one video without a Cognito session.
+
+A token is ``base64url(payload) + '.' + base64url(signature)``. The payload
+packs a version byte, the video id, the expiry (unix seconds), a scope bitmask
+and a random 8-byte token id into 30 bytes; the signature is HMAC-SHA256 over
+it with ``SHARE_TOKEN_SECRET``, truncated to 16 bytes. Verifying one needs no
+database or Cognito call, only the secret, plus a Redis ``GET`` when the
+caller checks the revocation denylist.
+"""
+import base64
+import binascii
+import hmac
+import os
+import struct
+import time
+import uuid
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.core.exceptions import UnauthorizedError
+from app.core.security import hmac_sha256
+from app.video.schemas import ShareScope
+
+TOKEN_VERSION = 1
+SIGNATURE_BYTES = 16
+_PAYLOAD = struct.Struct('>B16sIB8s')
+
+_SCOPE_BITS = {ShareScope.VIEW: 1, ShareScope.PLAYBACK: 2}
+
+
+@dataclass(frozen=True, slots=True)
+class ShareGrant:
+    video_id: uuid.UUID
+    expires_at: int
+    scope_bits: int
+    token_id: str
+
+    def allows(self, scope: ShareScope) -> bool:
+        return bool(self.scope_bits & _SCOPE_BITS[scope])
+
+
+def sharing_enabled() -> bool:
+    return bool(settings.SHARE_TOKEN_SECRET)
+
+
+def revoked_token_key(token_id: str) -> str:
+    return f'share:revoked:{token_id}'
+
+
+def issue_share_token(video_id: uuid.UUID, scopes: list[ShareScope], ttl_seconds: int) -> tuple[str, ShareGrant]:
+    grant = ShareGrant(
+        video_id=video_id,
+        expires_at=int(time.time()) + ttl_seconds,
+        scope_bits=sum(_SCOPE_BITS[scope] for scope in set(scopes)),
+        token_id=os.urandom(8).hex(),
+    )
+    payload = _PAYLOAD.pack(
+        TOKEN_VERSION, grant.video_id.bytes, grant.expires_at, grant.scope_bits, bytes.fromhex(grant.token_id)
+    )
+    return f'{_b64encode(payload)}.{_b64encode(_sign(payload))}', grant
+
+
+def verify_share_token(token: str, scope: ShareScope) -> ShareGrant:
+    """The grant in ``token`` if it is authentic, unexpired and covers ``scope``; revocation is checked by the caller."""
+    try:
+        encoded_payload, encoded_signature = token.split('.')
+        payload, signature = _b64decode(encoded_payload), _b64decode(encoded_signature)
+        version, video_id, expires_at, scope_bits, token_id = _PAYLOAD.unpack(payload)
+    except (ValueError, binascii.Error, struct.error):
+        raise UnauthorizedError('Invalid share link')
+
+    if version != TOKEN_VERSION or not hmac.compare_digest(signature, _sign(payload)):
+        raise UnauthorizedError('Invalid share link')
+    grant = ShareGrant(uuid.UUID(bytes=video_id), expires_at, scope_bits, token_id.hex())
+    if grant.expires_at <= time.time():
+        raise UnauthorizedError('Share link has expired')
+    if not grant.allows(scope):
+        raise UnauthorizedError('Share link does not grant this access')
+    return grant
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac_sha256(settings.SHARE_TOKEN_SECRET, payload)[:SIGNATURE_BYTES]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
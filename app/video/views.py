@@ -0,0 +1,198 @@
+"""View counting buffered in Redis and flushed to Postgres in batches.
+
+A view is one ``HINCRBY`` on a hash of pending deltas (plus the running total
+and a HyperLogLog of viewers), so hot videos never contend on their row. A
+background task periodically moves the pending hash aside with ``RENAME`` and
+applies every delta in a single ``UPDATE``.
+
+Views of public videos also feed the trending ranking: a sorted set scored
+with forward decay. Each view adds ``2 ** ((now - epoch) / half_life)``, so
+recent views outweigh old ones without ever rewriting existing scores; when
+the increments grow large the whole set is rescaled and the epoch moved.
+"""
+import asyncio
+import logging
+
+from redis import Redis, exceptions
+from redis.lock import Lock
+
+from app.core.cognito import get_s3_client
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exceptions import AppError
+from app.core.redis import get_redis_client
+from app.video.repository import VideoRepository
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = 'views:pending'
+FLUSHING_KEY = 'views:flushing'
+COUNTS_KEY = 'views:count'
+FLUSH_LOCK_KEY = 'views:flush:lock'
+TRENDING_KEY = 'trending:videos'
+TRENDING_EPOCH_KEY = 'trending:epoch'
+
+
+def unique_viewers_key(video_id: str) -> str:
+    return f'views:unique:{video_id}'
+
+
+# The running total is only bumped once it has been seeded from Postgres;
+# until then readers rebuild it from the row plus the buffered deltas. The
+# trending epoch is rebased after 32 half-lives, keeping increments below 2**33.
+_RECORD_VIEW_SCRIPT = """
+redis.call('HINCRBY', KEYS[1], ARGV[1], 1)
+if redis.call('HEXISTS', KEYS[2], ARGV[1]) == 1 then
+    redis.call('HINCRBY', KEYS[2], ARGV[1], 1)
+end
+redis.call('PFADD', KEYS[3], ARGV[2])
+
+if ARGV[3] == '1' then
+    local half_life = tonumber(ARGV[4])
+    local now = tonumber(redis.call('TIME')[1])
+    local epoch = tonumber(redis.call('GET', KEYS[5]))
+    if not epoch then
+        epoch = now
+        redis.call('SET', KEYS[5], epoch)
+    end
+    local periods = (now - epoch) / half_life
+    if periods > 32 then
+        local shift = math.floor(periods)
+        redis.call('ZUNIONSTORE', KEYS[4], 1, KEYS[4], 'WEIGHTS', tostring(2 ^ -shift))
+        redis.call('SET', KEYS[5], epoch + shift * half_life)
+        periods = periods - shift
+    end
+    redis.call('ZINCRBY', KEYS[4], tostring(2 ^ periods), ARGV[1])
+end
+"""
+
+
+# Seeds a running total from the Postgres count plus the deltas still
+# buffered, atomically with respect to recorded views; an existing total wins.
+_SEED_COUNT_SCRIPT = """
+local count = tonumber(ARGV[2])
+    + tonumber(redis.call('HGET', KEYS[2], ARGV[1]) or 0)
+    + tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or 0)
+redis.call('HSETNX', KEYS[1], ARGV[1], count)
+return redis.call('HGET', KEYS[1], ARGV[1])
+"""
+# Seeding holds the flush lock for one Postgres read; flushes skip a tick meanwhile.
+SEED_LOCK_TIMEOUT_SECONDS = 10
+
+
+class ViewCounter:
+    _script = None
+    _seed_script = None
+
+    def __init__(self, redis_client: Redis):
+        self.redis = redis_client
+
+    def record(self, video_id: str, viewer: str, trending: bool) -> None:
+        """Count a view; ``trending`` also scores it in the trending ranking."""
+        if ViewCounter._script is None:
+            ViewCounter._script = self.redis.register_script(_RECORD_VIEW_SCRIPT)
+        ViewCounter._script(
+            keys=[PENDING_KEY, COUNTS_KEY, unique_viewers_key(video_id), TRENDING_KEY, TRENDING_EPOCH_KEY],
+            args=[video_id, viewer, int(trending), settings.TRENDING_HALF_LIFE_SECONDS],
+            client=self.redis,
+        )
+
+    def trending(self, count: int) -> list[str]:
+        """Ids of the ``count`` highest-scoring videos, best first."""
+        return self.redis.zrevrange(TRENDING_KEY, 0, count - 1)
+
+    def remove_from_trending(self, video_ids: list[str]) -> None:
+        self.redis.zrem(TRENDING_KEY, *video_ids)
+
+    def cached_counts(self, video_ids: list[str]) -> dict[str, int]:
+        """Running totals already in Redis; ids without one are absent."""
+        counts = self.redis.hmget(COUNTS_KEY, video_ids)
+        return {video_id: int(count) for video_id, count in zip(video_ids, counts) if count is not None}
+
+    def buffered_deltas(self, video_ids: list[str]) -> dict[str, int]:
+        """Views recorded but not yet in Postgres, including a flush in progress."""
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.hmget(PENDING_KEY, video_ids)
+        pipeline.hmget(FLUSHING_KEY, video_ids)
+        pending, flushing = pipeline.execute()
+        return {
+            video_id: int(pending_delta or 0) + int(flushing_delta or 0)
+            for video_id, pending_delta, flushing_delta in zip(video_ids, pending, flushing)
+        }
+
+    def seed_lock(self) -> Lock:
+        """The flusher's lock. Hold it from reading Postgres to ``seed_counts``.
+
+        Otherwise a flush committing in between would have its deltas counted
+        twice, or not at all, and the running total never expires.
+        """
+        return self.redis.lock(FLUSH_LOCK_KEY, timeout=SEED_LOCK_TIMEOUT_SECONDS)
+
+    def seed_counts(self, stored: dict[str, int]) -> dict[str, int]:
+        """Seed running totals from Postgres counts plus buffered deltas; returns the totals now in Redis."""
+        if ViewCounter._seed_script is None:
+            ViewCounter._seed_script = self.redis.register_script(_SEED_COUNT_SCRIPT)
+        pipeline = self.redis.pipeline(transaction=False)
+        for video_id, views in stored.items():
+            ViewCounter._seed_script(
+                keys=[COUNTS_KEY, PENDING_KEY, FLUSHING_KEY], args=[video_id, views], client=pipeline
+            )
+        return {video_id: int(count) for video_id, count in zip(stored, pipeline.execute())}
+
+    def unique_viewers(self, video_id: str) -> int:
+        return self.redis.pfcount(unique_viewers_key(video_id))
+
+
+async def flush_view_counts(redis_client: Redis, video_repo: VideoRepository) -> int:
+    """Apply buffered deltas to ``videos.views``; returns the number of videos updated.
+
+    A lock keeps workers from flushing concurrently. A batch left in
+    ``views:flushing`` by a failed flush is retried before new deltas are taken.
+    """
+    lock = redis_client.lock(FLUSH_LOCK_KEY, timeout=max(30.0, settings.VIEW_FLUSH_INTERVAL_SECONDS * 3))
+    if not lock.acquire(blocking=False):
+        return 0
+
+    try:
+        # Keep the ranking bounded; the tail has decayed out of any top-K anyway.
+        redis_client.zremrangebyrank(TRENDING_KEY, 0, -settings.TRENDING_MAX_SIZE - 1)
+
+        if not redis_client.exists(FLUSHING_KEY):
+            try:
+                redis_client.rename(PENDING_KEY, FLUSHING_KEY)
+            except exceptions.ResponseError:
+                return 0  # Nothing pending
+
+        deltas = {video_id: int(delta) for video_id, delta in redis_client.hgetall(FLUSHING_KEY).items()}
+        if deltas:
+            await video_repo.add_views(deltas)
+        redis_client.delete(FLUSHING_KEY)
+        return len(deltas)
+    finally:
+        try:
+            lock.release()
+        except exceptions.LockError:
+            logger.warning("View flush outlived its lock")
+
+
+async def run_view_flusher(interval: float) -> None:
+    """Flush view counts every ``interval`` seconds until cancelled, then once more."""
+
+    async def flush_once() -> None:
+        database = SessionLocal()
+        try:
+            flushed = await flush_view_counts(get_redis_client(), VideoRepository(get_s3_client(), database))
+            if flushed:
+                logger.info("Flushed view counts of %d videos", flushed)
+        except (AppError, exceptions.RedisError) as e:
+            logger.error(f"View count flush failed: {e}")
+        finally:
+            database.close()
+
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            await flush_once()
+    except asyncio.CancelledError:
+        await flush_once()
+        raise
@@ -0,0 +1,125 @@
+"""Per-request CPU and memory cost of the identity objects and the Cognito secret hash.
+
+Compares the previous shapes against the current ones:
+
+- ``AuthUser`` as a plain dataclass vs the slotted frozen one, built from a
+  Cognito ``GetUser`` response the way ``get_current_user`` does it, timed
+  and measured with ``tracemalloc`` while ``--objects`` of them are alive;
+- ``SECRET_HASH`` keyed from the client secret on every call vs copied from a
+  pre-keyed HMAC, and vs the memoized result the refresh flow hits.
+
+    python -m benchmarks.auth_path --iterations 200000 --objects 100000
+"""
+import argparse
+import base64
+import hashlib
+import hmac
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+
+from benchmarks.stubs import use_placeholder_settings
+
+use_placeholder_settings()
+
+from app.core.entities.auth_user import AuthUser  # noqa: E402
+from app.core.security import get_secret_hash, hmac_sha256  # noqa: E402
+
+CLIENT_ID = '1example23456789clientid'
+CLIENT_SECRET = 'example-client-secret-0123456789abcdefghijklmnopqrstuvwxyz'
+
+
+@dataclass
+class PlainAuthUser:
+    """``AuthUser`` as it was: a regular dataclass with a per-instance ``__dict__``."""
+
+    email: str
+    email_verified: bool
+    name: str
+    sub: str
+
+
+def cognito_response() -> dict:
+    sub = str(uuid.uuid4())
+    return {
+        'Username': sub,
+        'UserAttributes': [
+            {'Name': 'sub', 'Value': sub},
+            {'Name': 'email_verified', 'Value': 'true'},
+            {'Name': 'name', 'Value': 'Benchmark User'},
+            {'Name': 'email', 'Value': f'{sub}@example.com'},
+        ],
+    }
+
+
+def build_user(cls, raw_user: dict):
+    user = {attribute['Name']: attribute['Value'] for attribute in raw_user['UserAttributes']}
+    return cls(
+        name=user['name'],
+        email=user['email'],
+        email_verified=user['email_verified'].lower() == 'true',
+        sub=user['sub'],
+    )
+
+
+def rekeyed_secret_hash(username: str, client_id: str, client_secret: str) -> str:
+    """The previous implementation: a fresh HMAC (and key schedule) per call."""
+    digest = hmac.new(client_secret.encode(), msg=(username + client_id).encode(), digestmod=hashlib.sha256).digest()
+    return base64.b64encode(digest).decode()
+
+
+def precompiled_secret_hash(username: str, client_id: str, client_secret: str) -> str:
+    """The current implementation without its memo: copy the pre-keyed HMAC."""
+    return base64.b64encode(hmac_sha256(client_secret, (username + client_id).encode())).decode()
+
+
+def time_per_call(function, args_list: list[tuple], iterations: int) -> float:
+    count = len(args_list)
+    start = time.perf_counter()
+    for index in range(iterations):
+        function(*args_list[index % count])
+    return (time.perf_counter() - start) * 1e9 / iterations
+
+
+def bytes_per_object(cls, responses: list[dict]) -> float:
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    users = [build_user(cls, raw_user) for raw_user in responses]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The attribute strings are shared by both shapes; the difference is the instance itself.
+    del users
+    return (current - baseline) / len(responses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=200_000, help='calls timed per row')
+    parser.add_argument('--objects', type=int, default=100_000, help='users alive while measuring memory')
+    parser.add_argument('--usernames', type=int, default=1000, help='distinct usernames hashed')
+    args = parser.parse_args()
+
+    responses = [cognito_response() for _ in range(args.objects)]
+    print(f'{"identity object":<28}{"ns/request":>12}{"bytes/object":>14}')
+    for label, cls in (('dataclass', PlainAuthUser), ('dataclass(slots, frozen)', AuthUser)):
+        per_call = time_per_call(lambda raw_user: build_user(cls, raw_user), [(r,) for r in responses], args.iterations)
+        print(f'{label:<28}{per_call:>12.0f}{bytes_per_object(cls, responses):>14.0f}')
+
+    usernames = [(f'user{index}@example.com', CLIENT_ID, CLIENT_SECRET) for index in range(args.usernames)]
+    get_secret_hash.cache_clear()
+    for username in usernames:
+        get_secret_hash(*username)
+    assert rekeyed_secret_hash(*usernames[0]) == get_secret_hash(*usernames[0])
+
+    print(f'\n{"secret hash":<28}{"ns/call":>12}')
+    for label, function in (
+            ('hmac.new per call', rekeyed_secret_hash),
+            ('pre-keyed copy()', precompiled_secret_hash),
+            ('memoized (refresh flow)', get_secret_hash),
+    ):
+        print(f'{label:<28}{time_per_call(function, usernames, args.iterations):>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
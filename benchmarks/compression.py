@@ -0,0 +1,93 @@
+"""CPU cost vs bytes saved when compressing feed pages, per encoding and level.
+
+Builds a page of ``--items`` serialised videos (the shape ``GET /videos``
+returns) and times gzip and brotli at several levels against it. The last
+rows time the cached path, where the page was compressed once when the cache
+entry was written and each request only copies the stored bytes.
+
+    pip install brotli
+    python -m benchmarks.compression --items 1000 --repeat 20
+"""
+import argparse
+import time
+import uuid
+import zlib
+
+from benchmarks.stubs import use_placeholder_settings
+
+use_placeholder_settings()
+
+from app.core.compression import brotli, encode_variants  # noqa: E402
+from app.video import schemas  # noqa: E402
+from app.video.service import _video_list_adapter  # noqa: E402
+
+
+def build_page(items: int) -> bytes:
+    videos = []
+    for index in range(items):
+        user_id = str(uuid.uuid4())
+        videos.append(schemas.Video(
+            id=uuid.uuid4(),
+            title=f'Benchmark video {index}',
+            description='A short description of the video, the kind users actually write.',
+            user_id=user_id,
+            video_s3_key=f'videos/{user_id}/{uuid.uuid4()}.mp4',
+            visibility='PUBLIC',
+            processing_status='COMPLETED',
+        ))
+    return _video_list_adapter.dump_json(videos)
+
+
+def _gzip(level: int):
+    def run(body: bytes) -> bytes:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return compressor.compress(body) + compressor.flush()
+    return run
+
+
+def _brotli(quality: int):
+    return lambda body: brotli.compress(body, quality=quality)
+
+
+def measure(name: str, compress, body: bytes, repeat: int) -> dict:
+    compressed = compress(body)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compress(body)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / repeat
+    return {
+        'name': name,
+        'bytes': len(compressed),
+        'ratio': len(body) / len(compressed),
+        'ms': elapsed_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000, help='videos per page')
+    parser.add_argument('--repeat', type=int, default=20, help='compressions timed per row')
+    args = parser.parse_args()
+
+    body = build_page(args.items)
+    codecs = [(f'gzip-{level}', _gzip(level)) for level in (1, 6, 9)]
+    if brotli is not None:
+        codecs += [(f'br-{quality}', _brotli(quality)) for quality in (1, 4, 6, 9, 11)]
+    else:
+        print('brotli is not installed; only gzip is measured\n')
+
+    rows = [measure(name, compress, body, args.repeat) for name, compress in codecs]
+    variants = encode_variants(body)
+    for encoding, encoded in variants.items():
+        # What a cache hit costs: the stored variant is only copied into the response.
+        rows.append(measure(f'cached-{encoding}', lambda _body, data=encoded: bytes(data), body, args.repeat))
+
+    print(f'{args.items} items, {len(body)} bytes uncompressed\n')
+    print(f'{"encoding":<16}{"bytes":>10}{"ratio":>8}{"ms/page":>10}{"MB/s":>9}')
+    for row in rows:
+        throughput = len(body) / (row['ms'] / 1000) / 1e6 if row['ms'] else float('inf')
+        print(f'{row["name"]:<16}{row["bytes"]:>10}{row["ratio"]:>8.1f}{row["ms"]:>10.3f}{throughput:>9.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Requests/sec through AccessLogMiddleware with synchronous vs queued logging.
+
+Drives a trivial ASGI endpoint wrapped in ``AccessLogMiddleware`` directly on
+the event loop (no sockets), so the only per-request overhead besides the
+endpoint is the access log line. ``--sink-latency-us`` simulates a slow stdout
+consumer (a container log driver under pressure) by sleeping on every write.
+
+    python -m benchmarks.logging_throughput --requests 20000 --sink-latency-us 50
+"""
+import argparse
+import asyncio
+import io
+import logging
+import os
+import time
+
+for _name, _value in {
+    "POSTGRES_DATABASE_URL": "sqlite://", "POSTGRES_USER": "bench", "POSTGRES_PASSWORD": "bench",
+    "POSTGRES_DB": "bench", "COGNITO_CLIENT_ID": "bench", "COGNITO_CLIENT_SECRET": "bench",
+    "REGION_NAME": "us-east-1", "AWS_ACCESS_KEY_ID": "bench", "AWS_SECRET_ACCESS_KEY": "bench",
+    "S3_RAW_VIDEOS_BUCKET": "bench", "S3_PROCESSED_VIDEOS_BUCKET": "bench",
+    "S3_VIDEO_THUMBNAILS_BUCKET": "bench", "REDIS_HOST": "localhost", "REDIS_PORT": "6379",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from app.core.logging_config import LOGGING_CONFIG, setup_logging, stop_logging  # noqa: E402
+from app.core.middleware import AccessLogMiddleware  # noqa: E402
+
+
+class SlowSink(io.TextIOBase):
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        self.lines += 1
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+async def _endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _drive(app, requests: int, concurrency: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/upload/videos", "headers": [], "query_string": b""}
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_message):
+        pass
+
+    async def worker(count: int):
+        for _ in range(count):
+            await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    per_worker = requests // concurrency
+    await asyncio.gather(*(worker(per_worker) for _ in range(concurrency)))
+    return per_worker * concurrency / (time.perf_counter() - start)
+
+
+def _run(mode: str, sink: SlowSink, args) -> float:
+    for handler in LOGGING_CONFIG["handlers"].values():
+        handler["stream"] = sink
+    setup_logging(use_queue=mode == "queue")
+    try:
+        return asyncio.run(_drive(AccessLogMiddleware(_endpoint), args.requests, args.concurrency))
+    finally:
+        stop_logging()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--sink-latency-us", type=float, default=0.0)
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ("sync", "queue"):
+        sink = SlowSink(args.sink_latency_us / 1_000_000)
+        results[mode] = _run(mode, sink, args)
+
+    print(f"requests={args.requests} concurrency={args.concurrency} sink_latency={args.sink_latency_us}us")
+    for mode, rps in results.items():
+        print(f"  {mode:<6} {rps:>10.0f} req/s")
+    print(f"  speedup {results['queue'] / results['sync']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Gunicorn settings for the production server; picked up automatically from the working directory.
+
+    gunicorn app.main:app
+
+Tune with the ``SERVER_*`` settings rather than editing this file.
+"""
+import os
+import shutil
+
+from app.core.config import settings
+from app.core.server import AppWorker, shutdown_timeout, worker_count
+
+bind = settings.SERVER_BIND
+workers = worker_count()
+worker_class = AppWorker
+keepalive = settings.SERVER_KEEPALIVE_SECONDS
+backlog = settings.SERVER_BACKLOG
+graceful_timeout = shutdown_timeout()
+# Workers build their own DB, Redis and AWS pools after the fork; sharing them across processes is unsafe.
+preload_app = False
+# Only the load balancer / API Gateway in front may set the client IP the rate limiter keys on.
+forwarded_allow_ips = settings.SERVER_FORWARDED_ALLOW_IPS
+accesslog = None
+
+
+def on_starting(server):
+    # Samples left by a previous run would otherwise be summed into the new one.
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Covers workers that die without running the lifespan shutdown.
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)